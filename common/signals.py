@@ -0,0 +1,30 @@
+# common/signals.py
+from functools import lru_cache
+
+from django.db import models
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from core.images import normalize_field_file
+
+
+@lru_cache(maxsize=None)
+def _image_fields(model) -> tuple[str, ...]:
+    return tuple(f.attname for f in model._meta.concrete_fields if isinstance(f, models.ImageField))
+
+
+@receiver(pre_save)
+def normalize_uploaded_images(sender, instance, raw=False, **kwargs):
+    # barcha modellardagi ImageField: yangi yuklangan fayl diskka yozilishidan oldin normalizatsiya
+    if raw:
+        return
+    for name in _image_fields(sender):
+        normalize_field_file(getattr(instance, name))
+
+
+@receiver(pre_save)
+def reject_language_scoped(sender, instance, **kwargs):
+    # core.i18n.LanguageScopedQuerySet.for_language(): til ustunlarida bitta (tanlangan) qiymat — saqlansa
+    # boshqa tillar ustiga yozilib ketadi
+    if getattr(instance, "_language_scoped", None):
+        raise ValueError(f"{sender.__name__} #{instance.pk} was loaded with for_language() and is read-only.")
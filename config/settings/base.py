@@ -52,9 +52,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',  # hozircha sqlite; keyin Postgresga o‘tamiz
         'NAME': BASE_DIR / 'db.sqlite3',
+        # BEGIN IMMEDIATE: yozuvchi tranzaksiya boshidanoq navbat kutadi (timeout soniya),
+        # o‘qishdan yozishga o‘tishda "database is locked" bo‘lmaydi (o‘rin band qilish va h.k.)
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        # test DB ham fayl: in-memory (shared cache) da parallel ulanishlar timeout'ni kutmay "table is locked" oladi
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Kesh: gunicorn worker'lari orasida umumiy bo‘lishi kerak (LocMem har process'da alohida)
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": config("CACHE_LOCATION", default=str(BASE_DIR / ".cache")),
+        "TIMEOUT": 300,
+    }
+}
+# Tur ro‘yxati javoblari keshi (soniya); katalog o‘zgarganda versiya bilan eskiradi
+TOURS_LIST_CACHE_TIMEOUT = 600
+# "O‘xshash turlar": har tur uchun saqlanadigan qo‘shnilar soni (tours.similarity)
+TOURS_SIMILAR_K = 8
+# Narxlarni solishtirish valyutasi: Tour.effective_price_base va ExchangeRate shunga nisbatan
+BASE_CURRENCY = config("BASE_CURRENCY", default="USD")
+
+# Fon ishlari (core.background): True — darhol, so‘rov ichida (dev/debug uchun)
+BACKGROUND_TASKS_SYNC = config("BACKGROUND_TASKS_SYNC", default=False, cast=bool)
+BACKGROUND_TASK_WORKERS = 2
+# Arizadagi jo‘nash o‘rinlari shu muddatgacha band turadi (leads.holds)
+SEAT_HOLD_MINUTES = 60 * 24
+
+# Yuklangan rasmlar (core.images.normalize_image): eng uzun tomon, px va qayta kodlash sifati
+IMAGE_UPLOAD_MAX_SIDE = 2560
+IMAGE_UPLOAD_QUALITY = 85
+# Rasm nusxalari (core.images): nom -> kenglik, px
+IMAGE_VARIANTS = {"thumb": 160, "card": 480, "hero": 1280}
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -94,6 +126,22 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = "/var/www/horuntravel/static"
 MEDIA_ROOT  = "/var/www/horuntravel/media"
 
+# Statik sitemap'lar (tours.sitemaps, `python manage.py build_sitemaps`): nginx SITEMAP_ROOT ni SITEMAP_URL da beradi
+SITE_URL = config("SITE_URL", default="https://horuntravel.com")
+SITEMAP_ROOT = config("SITEMAP_ROOT", default="/var/www/horuntravel/sitemaps")
+SITEMAP_URL = config("SITEMAP_URL", default="https://horuntravel.com/sitemaps")
+SITEMAP_CHUNK_SIZE = 50000
+# frontend sahifa yo‘llari ({lang}, {slug})
+SITEMAP_PATHS = {
+    "tour": "/{lang}/tours/{slug}",
+    "category": "/{lang}/tours/category/{slug}",
+}
+
+# Statik katalog eksporti (tours.export, `python manage.py export_catalog`): CDN CATALOG_EXPORT_ROOT ni beradi.
+# CATALOG_EXPORT_HOST — javoblardagi absolyut URL'lar (media, next/previous) uchun, ALLOWED_HOSTS da bo‘lsin
+CATALOG_EXPORT_ROOT = config("CATALOG_EXPORT_ROOT", default="/var/www/horuntravel/catalog")
+CATALOG_EXPORT_HOST = config("CATALOG_EXPORT_HOST", default="horuntravel.com")
+
 CORS_ALLOW_ALL_ORIGINS = True  # prod’da domen bilan cheklaysiz
 
 # REST_FRAMEWORK = {
@@ -138,6 +186,8 @@ JAZZMIN_SETTINGS = {
 # }
 
 CKEDITOR_5_UPLOADS_DIRECTORY = "uploads/ckeditor5/"
+# yuklamalar shu papkaga, rasm normalizatsiyasi bilan (core.images.normalize_image)
+CKEDITOR_5_FILE_STORAGE = "core.storage.CKEditorUploadStorage"
 CKEDITOR_5_CONFIGS = {
     "default": {
         "toolbar": [
@@ -0,0 +1,52 @@
+# core/background.py
+"""
+So‘rov yo‘lidan tashqari bajariladigan ishlar (rasm qayta ishlash va h.k.).
+
+Loyihada task queue yo‘q: ish commit'dan keyin shu process ichidagi kichik thread pool'da
+bajariladi. settings.BACKGROUND_TASKS_SYNC = True bo‘lsa (management buyruqlar, dev) — darhol.
+Worker qayta ishga tushib ish yo‘qolsa, tegishli backfill buyrug‘i bilan tiklanadi.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+log = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "BACKGROUND_TASK_WORKERS", 2), thread_name_prefix="background"
+        )
+    return _executor
+
+
+def _call(func, args):
+    try:
+        func(*args)
+    except Exception as e:
+        log.exception("Background task %s failed: %s", getattr(func, "__name__", func), e)
+
+
+def _run_in_thread(func, args):
+    try:
+        _call(func, args)
+    finally:
+        # thread o‘z DB ulanishini ochgan — yopib ketamiz
+        connection.close()
+
+
+def run_in_background(func, *args) -> None:
+    """func(*args) ni joriy tranzaksiya commit bo‘lgandan keyin fon thread'ida chaqiradi."""
+    def submit():
+        if getattr(settings, "BACKGROUND_TASKS_SYNC", False):
+            _call(func, args)
+        else:
+            _get_executor().submit(_run_in_thread, func, args)
+
+    transaction.on_commit(submit)
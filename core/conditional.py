@@ -0,0 +1,94 @@
+# core/conditional.py
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from core.i18n import lang
+
+# Javob tili shu header'larga bog‘liq (core.middleware.APILanguageMiddleware)
+LANGUAGE_VARY = ("X-Language", "Accept-Language")
+
+
+def normalized_query(request) -> str:
+    """?b=2&a=1&a=0 -> 'a=0&a=1&b=2' — parametrlar tartibi kalitga ta’sir qilmaydi."""
+    params = request.query_params
+    return "&".join(
+        f"{key}={value}"
+        for key in sorted(params)
+        for value in sorted(params.getlist(key))
+    )
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def respond_conditionally(request, etag: str, last_modified, build):
+    """
+    So‘rovdagi If-None-Match / If-Modified-Since validatorlarga mos kelsa — 304,
+    serializer umuman chaqirilmaydi. Aks holda build() javobiga ETag/Last-Modified qo‘yiladi.
+    last_modified: datetime yoki None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build()
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, LANGUAGE_VARY)
+    return response
+
+
+def latest(*stamps):
+    stamps = [s for s in stamps if s]
+    return max(stamps) if stamps else None
+
+
+class ConditionalGetMixin:
+    """
+    ReadOnly viewset'lar uchun shartli GET.
+    - list: filtrlangan to‘plam bo‘yicha max(updated_at) + soni + query + til — faqat ETag.
+      Last-Modified yuborilmaydi: yozuv to‘plamdan chiqsa/o‘chirilsa max(updated_at) kamayadi,
+      If-Modified-Since bilan tekshiradigan CDN/brauzer eskirgan ro‘yxatga 304 olardi.
+    - retrieve: obyektning updated_at + til
+    conditional_related — nested serializer'dagi FK'lar (masalan "country"),
+    ularning updated_at ham validatorga qo‘shiladi.
+    """
+    conditional_related = ()
+
+    def conditional_etag_parts(self) -> tuple:
+        # javob vaqtga bog‘liq bo‘lsa (masalan "bugundan keyingi" hisoblar) — qo‘shimcha qismlar
+        return ()
+
+    def conditional_list(self, request, build):
+        queryset = self.filter_queryset(self.get_queryset())
+        aggregates = {"last": Max("updated_at"), "total": Count("pk")}
+        for i, rel in enumerate(self.conditional_related):
+            aggregates[f"rel{i}"] = Max(f"{rel}__updated_at")
+        stats = queryset.order_by().aggregate(**aggregates)
+        total = stats.pop("total")
+        last_modified = latest(*stats.values())
+        etag = make_etag("list", lang(), normalized_query(request), total, last_modified, *self.conditional_etag_parts())
+        return respond_conditionally(request, etag, None, build)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(
+            request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = latest(
+            instance.updated_at,
+            *(getattr(getattr(instance, rel, None), "updated_at", None) for rel in self.conditional_related),
+        )
+        etag = make_etag("detail", lang(), instance.pk, last_modified)
+        return respond_conditionally(
+            request, etag, last_modified, lambda: Response(self.get_serializer(instance).data)
+        )
@@ -0,0 +1,88 @@
+# core/geo.py
+"""
+Sfera ustidagi oddiy geometriya (katta doira masofasi, bbox, markaz).
+Nuqtalar — (lat, lng) gradusda; numpy/PostGIS talab qilinmaydi.
+SQL qismi (bbox_q, distance_expression) Django funksiyalari orqali — SQLite'da ham ishlaydi.
+"""
+from math import asin, atan2, cos, degrees, hypot, radians, sin, sqrt
+
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+# o‘rtacha Yer radiusi (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> float:
+    phi1, phi2 = radians(lat1), radians(lat2)
+    a = sin((phi2 - phi1) / 2) ** 2 + cos(phi1) * cos(phi2) * sin(radians(lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def path_length_km(points) -> float:
+    """Ketma-ket nuqtalar orasidagi masofalar yig‘indisi."""
+    return sum(haversine_km(*a, *b) for a, b in zip(points, points[1:]))
+
+
+def bounding_box(points) -> dict:
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    return {"south": min(lats), "west": min(lngs), "north": max(lats), "east": max(lngs)}
+
+
+def centroid(points) -> dict:
+    """Sferik markaz (birlik vektorlar o‘rtachasi) — 180° meridiandan o‘tgan marshrutda ham to‘g‘ri."""
+    x = y = z = 0.0
+    for lat, lng in points:
+        phi, lam = radians(lat), radians(lng)
+        x += cos(phi) * cos(lam)
+        y += cos(phi) * sin(lam)
+        z += sin(phi)
+    return {"lat": degrees(atan2(z, hypot(x, y))), "lng": degrees(atan2(y, x))}
+
+
+
+def degree_box(lat, lng, radius_km) -> tuple[float, float, float, float]:
+    """(lat_min, lat_max, lng_min, lng_max): radius_km doirasini o‘rab turgan kenglik/uzunlik oralig‘i."""
+    dlat = degrees(radius_km / EARTH_RADIUS_KM)
+    scale = cos(radians(min(90.0, abs(lat) + dlat)))
+    dlng = 180.0 if scale < 1e-6 else min(180.0, dlat / scale)
+    return max(-90.0, lat - dlat), min(90.0, lat + dlat), lng - dlng, lng + dlng
+
+
+def bbox_q(lat, lng, radius_km, prefix: str = "") -> Q:
+    """
+    Indekslangan lat/lng ustunlari bo‘yicha oldindan saralash (ikki oraliq sharti).
+    180° meridiandan o‘tsa uzunlik ikki oraliqqa bo‘linadi.
+    """
+    lat_min, lat_max, lng_min, lng_max = degree_box(lat, lng, radius_km)
+    q = Q(**{f"{prefix}lat__range": (lat_min, lat_max)})
+    if lng_max - lng_min >= 360:
+        return q
+    if lng_min < -180:
+        return q & (Q(**{f"{prefix}lng__gte": lng_min + 360}) | Q(**{f"{prefix}lng__lte": lng_max}))
+    if lng_max > 180:
+        return q & (Q(**{f"{prefix}lng__gte": lng_min}) | Q(**{f"{prefix}lng__lte": lng_max - 360}))
+    return q & Q(**{f"{prefix}lng__range": (lng_min, lng_max)})
+
+
+def distance_expression(lat, lng, prefix: str = ""):
+    """SQL'dagi haversine (km): nuqtadan `<prefix>lat`/`<prefix>lng` ustunlarigacha."""
+    row_lat = Radians(Cast(F(f"{prefix}lat"), FloatField()))
+    row_lng = Radians(Cast(F(f"{prefix}lng"), FloatField()))
+    phi, lam = Value(radians(lat)), Value(radians(lng))
+    a = (
+        Power(Sin((row_lat - phi) / 2), 2)
+        + Value(cos(radians(lat))) * Cos(row_lat) * Power(Sin((row_lng - lam) / 2), 2)
+    )
+    return ExpressionWrapper(
+        Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(Value(1.0), a))), output_field=FloatField()
+    )
+
+
+def parse_point(value: str) -> tuple[float, float]:
+    """"41.31,69.28" -> (41.31, 69.28); noto‘g‘ri bo‘lsa ValueError."""
+    lat, lng = (float(part) for part in value.split(","))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError(value)
+    return lat, lng
@@ -1,5 +1,12 @@
 # core/i18n.py
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.query import ModelIterable
 from django.utils.translation import get_language
+from modeltranslation.settings import AVAILABLE_LANGUAGES
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import build_localized_fieldname, resolution_order
 
 def lang():  # "uz" / "ru" / "en"
     return (get_language() or "uz").split("-")[0]
@@ -12,3 +19,66 @@ def pick_lang(obj, base_name: str):
     l = lang()
     attr = f"{base_name}_{l}"
     return getattr(obj, attr, getattr(obj, base_name, ""))
+
+
+def translated_fields(model) -> tuple[str, ...]:
+    try:
+        return tuple(translator.get_options_for_model(model).fields)
+    except NotRegistered:
+        return ()
+
+
+class LanguageScopedIterable(ModelIterable):
+    """
+    for_language() natijasi: har bir tarjima maydoni uchun SQL'da tanlangan bitta qiymat
+    barcha til ustunlariga qo‘yiladi — descriptor (title -> title_<til>) qaysi tilda o‘qisa ham
+    shu qiymatni oladi, kechiktirilgan ustun uchun qo‘shimcha so‘rov bo‘lmaydi.
+    """
+
+    def __iter__(self):
+        language, fields = self.queryset._language_scope
+        for obj in super().__iter__():
+            for name in fields:
+                value = obj.__dict__.pop(f"{name}_scoped")
+                for code in AVAILABLE_LANGUAGES:
+                    obj.__dict__[build_localized_fieldname(name, code)] = value
+            obj._language_scoped = language
+            yield obj
+
+
+class LanguageScopedQuerySet(models.QuerySet):
+    """
+    .for_language() — faqat o‘qish uchun: tarjima maydonlarining barcha til ustunlari
+    (va asl ustun) o‘rniga bitta qiymat yuklanadi: aktiv til, bo‘sh bo‘lsa fallback tillari
+    (MODELTRANSLATION_FALLBACK_LANGUAGES tartibida) — COALESCE(NULLIF(..., ''), ...) DB ichida.
+    Allaqachon defer()/only() bilan chiqarib tashlangan maydonlarga tegilmaydi.
+    Bunday obyektni saqlab bo‘lmaydi (common.signals).
+    """
+    _language_scope = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._language_scope = self._language_scope
+        return clone
+
+    def for_language(self, language=None):
+        language = language or lang()
+        names, defer = self.query.deferred_loading
+        fields, deferred, annotations = [], [], {}
+        for name in translated_fields(self.model):
+            active = build_localized_fieldname(name, language)
+            if (active in names) == defer:
+                continue  # so‘rovda yo‘q maydon
+            columns = [build_localized_fieldname(name, code) for code in resolution_order(language)]
+            field = self.model._meta.get_field(name)
+            fields.append(name)
+            deferred.append(name)
+            annotations[f"{name}_scoped"] = Coalesce(
+                *(NullIf(F(column), Value("")) for column in columns), Value(""), output_field=field
+            )
+        if not fields:
+            return self._chain()
+        clone = self.defer(*deferred).annotate(**annotations)
+        clone._language_scope = (language, tuple(fields))
+        clone._iterable_class = LanguageScopedIterable
+        return clone
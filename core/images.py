@@ -0,0 +1,190 @@
+# core/images.py
+"""
+Yuklangan rasmlar:
+- normalize_image: yuklash paytida — o‘lchamni cheklash, EXIF orientatsiya + EXIF'ni olib tashlash, qayta kodlash
+- build_derivatives: belgilangan kenglikdagi nusxalar (derivative) — WebP va JPEG,
+  original o‘lchamlari va ~20px LQIP placeholder (base64 data URI).
+Fayllar original yonidagi `derivatives/` papkasiga yoziladi, natija modeldagi JSON ustunda saqlanadi:
+  {"source": "tours/images/a.jpg", "width": 2560, "height": 1707, "placeholder": "data:image/webp;base64,...",
+   "thumb": {"width": 160, "webp": "tours/images/derivatives/a-thumb.webp", "jpeg": "..."}, ...}
+"""
+import base64
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import ExifTags, Image, ImageOps
+
+# nom -> kenglik (px); settings.IMAGE_VARIANTS bilan almashtiriladi
+DEFAULT_VARIANTS = {"thumb": 160, "card": 480, "hero": 1280}
+
+# yuklashda eng uzun tomon (px) va JPEG/WebP sifati; settings.IMAGE_UPLOAD_MAX_SIDE / IMAGE_UPLOAD_QUALITY
+DEFAULT_UPLOAD_MAX_SIDE = 2560
+DEFAULT_UPLOAD_QUALITY = 85
+
+# LQIP: eng uzun tomoni (px) va sifati — data URI odatda 200–400 bayt
+PLACEHOLDER_SIDE = 20
+PLACEHOLDER_QUALITY = 40
+
+# EXIF orientatsiyasi 5..8 — rasm 90° ga buriladi (eni va bo‘yi almashadi)
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+# kengaytma -> (Pillow format, save parametrlari)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def image_variants() -> dict:
+    return getattr(settings, "IMAGE_VARIANTS", DEFAULT_VARIANTS)
+
+
+def derivative_name(name: str, variant: str, ext: str) -> str:
+    path = PurePosixPath(name)
+    return str(path.parent / "derivatives" / f"{path.stem}-{variant}.{ext}")
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    # JPEG'da alfa kanal yo‘q — shaffof joylar oq fonga
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _encode(img: Image.Image, fmt: str, quality: int, icc_profile=None) -> bytes:
+    buffer = BytesIO()
+    options = {"icc_profile": icc_profile} if icc_profile else {}
+    if fmt == "JPEG":
+        img.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True, **options)
+    elif fmt == "WEBP":
+        img.save(buffer, "WEBP", quality=quality, method=4, **options)
+    else:
+        img.save(buffer, "PNG", optimize=True, **options)
+    return buffer.getvalue()
+
+
+def normalize_image(content):
+    """
+    Yuklangan JPEG/PNG/WebP ni tozalaydi: EXIF orientatsiya qo‘llanadi, EXIF (GPS va h.k.) tashlanadi,
+    eng uzun tomon IMAGE_UPLOAD_MAX_SIDE gacha kichraytiriladi, o‘sha formatda qayta kodlanadi.
+    Xotira: JPEG draft() bilan 1/2..1/8 masshtabda o‘qiladi, qolganlari thumbnail(reducing_gap) — reduce().
+    Qaytaradi: yangi baytlar yoki None (format qo‘llab-quvvatlanmaydi — SVG/ICO/GIF, yoki foydasi yo‘q).
+    """
+    max_side = getattr(settings, "IMAGE_UPLOAD_MAX_SIDE", DEFAULT_UPLOAD_MAX_SIDE)
+    quality = getattr(settings, "IMAGE_UPLOAD_QUALITY", DEFAULT_UPLOAD_QUALITY)
+
+    content.seek(0)
+    original = content.read()
+    content.seek(0)
+    try:
+        img = Image.open(BytesIO(original))
+        fmt = "JPEG" if img.format == "MPO" else img.format  # telefon JPEG'lari MPO bo‘lib ochiladi
+        if fmt not in ("JPEG", "PNG", "WEBP") or getattr(img, "is_animated", False):
+            return None
+        has_exif = bool(img.getexif())
+        oversized = max(img.size) > max_side
+        icc_profile = img.info.get("icc_profile")
+        if fmt == "JPEG":
+            img.draft("RGB", (max_side, max_side))
+        img = ImageOps.exif_transpose(img)
+        if img.mode == "P":
+            img = img.convert("RGBA")  # palitrada LANCZOS ishlamaydi
+        img.thumbnail((max_side, max_side), Image.LANCZOS, reducing_gap=3.0)
+        if fmt == "JPEG":
+            img = _to_rgb(img)
+        data = _encode(img, fmt, quality, icc_profile)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    # EXIF ham yo‘q, o‘lcham ham me’yorda — qayta kodlash faqat kichraytirsa
+    if not (has_exif or oversized) and len(data) >= len(original):
+        return None
+    return data
+
+
+def normalize_field_file(field_file) -> None:
+    """Hali saqlanmagan (yangi yuklangan) FieldFile kontentini normalize_image natijasi bilan almashtiradi."""
+    if not field_file or getattr(field_file, "_committed", True):
+        return
+    data = normalize_image(field_file.file)
+    if data is not None:
+        field_file.file = ContentFile(data, name=field_file.name)
+
+
+def build_derivatives(field_file) -> dict:
+    """
+    Har bir variant uchun WebP + JPEG yozadi (kichikroq originalni kattalashtirmaydi).
+    JPEG'da draft() — dekoder to‘g‘ridan-to‘g‘ri kichraytirib o‘qiydi, to‘liq o‘lchamdagi bitmap xotiraga tushmaydi.
+    """
+    storage = field_file.storage
+    variants = sorted(image_variants().items(), key=lambda item: -item[1])
+    largest = variants[0][1]
+
+    with storage.open(field_file.name, "rb") as fh:
+        img = Image.open(fh)
+        width, height = img.size
+        if img.getexif().get(ExifTags.Base.Orientation) in _ROTATED_ORIENTATIONS:
+            width, height = height, width
+        img.draft("RGB", (largest, largest))
+        img = _to_rgb(ImageOps.exif_transpose(img))
+
+    result = {"source": field_file.name, "width": width, "height": height}
+    # kattadan kichikka: har bir variant oldingisidan kichraytiriladi
+    for variant, width in variants:
+        if img.width > width:
+            img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+        entry = {"width": img.width}
+        for ext, (fmt, options) in FORMATS.items():
+            buffer = BytesIO()
+            img.save(buffer, fmt, **options)
+            name = derivative_name(field_file.name, variant, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            entry[ext] = storage.save(name, ContentFile(buffer.getvalue()))
+        result[variant] = entry
+    result["placeholder"] = placeholder_data_uri(img)
+    return result
+
+
+def placeholder_data_uri(img: Image.Image) -> str:
+    """Juda kichik WebP nusxa — klient uni cho‘zib, blur bilan haqiqiy rasm kelguncha ko‘rsatadi."""
+    tiny = img.copy()
+    tiny.thumbnail((PLACEHOLDER_SIDE, PLACEHOLDER_SIDE), Image.LANCZOS)
+    buffer = BytesIO()
+    tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def delete_derivatives(storage, variants: dict) -> None:
+    for entry in (variants or {}).values():
+        if not isinstance(entry, dict):
+            continue
+        for ext in FORMATS:
+            if entry.get(ext):
+                storage.delete(entry[ext])
+
+
+def variant_url(field_file, variants: dict, variant: str, ext: str = "jpeg"):
+    """Variant tayyor bo‘lsa — uning URL'i, aks holda originalniki."""
+    entry = (variants or {}).get(variant)
+    if isinstance(entry, dict) and entry.get(ext):
+        return field_file.storage.url(entry[ext])
+    return field_file.url
+
+
+def srcset(storage, variants: dict, build_url=None) -> dict:
+    """{"webp": "<url> 160w, <url> 480w, ...", "jpeg": "..."}; variantlar hali tayyor bo‘lmasa — {}."""
+    build_url = build_url or (lambda url: url)
+    # kichik originalda bir nechta variant bir xil kenglikda bo‘lishi mumkin — bittasi yetadi
+    by_width = {entry["width"]: entry for entry in (variants or {}).values() if isinstance(entry, dict)}
+    entries = [by_width[width] for width in sorted(by_width)]
+    if not entries:
+        return {}
+    return {
+        ext: ", ".join(f"{build_url(storage.url(entry[ext]))} {entry['width']}w" for entry in entries)
+        for ext in FORMATS
+    }
@@ -1,6 +1,189 @@
 # core/pagination.py
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = "page_size"    # ?page_size=24
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Kursor (keyset) pagination: ?cursor=<opaque>.
+    Sahifa oxirgi qatorning tartib kalitlari bo‘yicha WHERE (a, b, id) > (...) bilan olinadi —
+    OFFSET yo‘q, chuqur sahifa ham 1-sahifa narxida. COUNT(*) faqat ?count=1 bo‘lsa.
+    Tartib `ordering` bilan qat’iy belgilangan (oxirgisi unikal bo‘lishi shart, odatda "id").
+    exclusive_params — tartibni o‘zgartiradigan parametrlar (?ordering=, ?search=, ...): kursor ular
+    bilan birga kelsa 400 (aks holda tartib jimgina `ordering` ga almashib qolardi).
+    """
+    ordering = ("-created_at", "id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+    exclusive_params = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        conflicts = [p for p in self.exclusive_params if request.query_params.get(p)]
+        if conflicts:
+            raise ValidationError({p: "Kursor pagination (?paginate=cursor) bilan ishlatilmaydi." for p in conflicts})
+        values, reverse = self.decode_cursor(request, queryset.model)
+        self.count = queryset.count() if request.query_params.get(self.count_query_param) in ("1", "true") else None
+
+        ordering = [self._flip(f) for f in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # oldinga/orqaga: teskari yo‘nalishda "ko‘proq bor"ligi — kursor bo‘lgani uchun ma’lum
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.last_row, False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.first_row, True))
+
+    # --- kursor kodlash ---
+    def encode_cursor(self, row, reverse: bool) -> str:
+        values = [self._plain(getattr(row, f.lstrip("-"))) for f in self.ordering]
+        raw = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, model=None):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+            data = json.loads(raw)
+            values, reverse = data["v"], bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if model is not None:
+            values = [self._typed(model, field.lstrip("-"), value) for field, value in zip(self.ordering, values)]
+        return values, reverse
+
+    def _typed(self, model, name, value):
+        """Kursor qiymati -> ustun turi (int, aware datetime, ...); mos kelmasa — 404, SQL'gacha yetmaydi."""
+        try:
+            value = model._meta.get_field(name).to_python(value)
+        except (FieldDoesNotExist, DjangoValidationError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or isinstance(value, (dict, list)):
+            raise NotFound(self.invalid_cursor_message)
+        if hasattr(value, "tzinfo") and hasattr(value, "hour") and timezone.is_naive(value):
+            value = timezone.make_aware(value, timezone.get_default_timezone())
+        return value
+
+    @staticmethod
+    def _plain(value):
+        # to‘liq aniqlik: DjangoJSONEncoder datetime'ni millisekundgacha qisqartiradi
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, values) -> Q:
+        """(a, -b, c) > (x, y, z) -> a>x OR (a=x AND b<y) OR (a=x AND b=y AND c>z)."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+
+class CatalogCursorPagination(KeysetPagination):
+    """
+    Katalog tartibi: Tour.Meta.ordering + unikal id. ?ordering=, ?search= (relevantlik) va
+    ?near= (masofa) o‘z tartibini beradi — kursor rejimida ular rad etiladi.
+    """
+    ordering = ("order", "-created_at", "id")
+    exclusive_params = ("ordering", "search", "near")
+
+
+class SelectablePaginationMixin:
+    """
+    So‘rov bo‘yicha pagination rejimi: ?paginate=cursor (yoki ?cursor=...) — cursor_pagination_class,
+    aks holda viewset'ning odatiy pagination_class'i (sahifa raqami).
+    """
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            params = request.query_params if request is not None else {}
+            if self.cursor_pagination_class and (params.get("paginate") == "cursor" or "cursor" in params):
+                self._paginator = self.cursor_pagination_class()
+                return self._paginator
+        return super().paginator
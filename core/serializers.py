@@ -0,0 +1,49 @@
+# core/serializers.py
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def param_list(request, name) -> list[str]:
+    """?fields=a,b&fields=c -> ["a", "b", "c"]"""
+    if request is None:
+        return []
+    raw = ",".join(request.query_params.getlist(name))
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def sparse_fields(request, serializer_class) -> list[str]:
+    """
+    Javobga kiradigan maydonlar (Meta.fields tartibida):
+      ?fields=id,slug,title  — faqat shular
+      ?expand=departures     — Meta.expandable_fields dagi (odatda yashirin) maydonlarni qo‘shadi
+    Parametrlarsiz — Meta.fields minus expandable_fields. Noma’lum nomlar e’tiborsiz qoldiriladi.
+    """
+    meta = serializer_class.Meta
+    expandable = set(getattr(meta, "expandable_fields", ()))
+    requested = set(param_list(request, FIELDS_PARAM))
+    expanded = set(param_list(request, EXPAND_PARAM))
+    if requested:
+        wanted = requested | expanded
+    else:
+        wanted = {name for name in meta.fields if name not in expandable} | expanded
+    return [name for name in meta.fields if name in wanted]
+
+
+def is_sparse(request) -> bool:
+    return bool(param_list(request, FIELDS_PARAM) or param_list(request, EXPAND_PARAM))
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer uchun ?fields= / ?expand= (sparse_fields ga qarang).
+    Keraksiz maydonlar serializer'dan olib tashlanadi — ular umuman hisoblanmaydi;
+    view esa shu ro‘yxat bo‘yicha select_related/prefetch'ni tanlaydi.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = set(sparse_fields(self.context.get("request"), type(self)))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
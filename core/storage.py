@@ -0,0 +1,27 @@
+# core/storage.py
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from core.images import normalize_image
+
+
+class CKEditorUploadStorage(FileSystemStorage):
+    """
+    CKEditor 5 yuklamalari (settings.CKEDITOR_5_FILE_STORAGE): CKEDITOR_5_UPLOADS_DIRECTORY ichiga,
+    modeldagi ImageField'lar kabi normalize_image'dan o‘tib saqlanadi.
+    """
+
+    def __init__(self, **kwargs):
+        directory = settings.CKEDITOR_5_UPLOADS_DIRECTORY
+        kwargs.setdefault("location", os.path.join(settings.MEDIA_ROOT, directory))
+        kwargs.setdefault("base_url", settings.MEDIA_URL + directory)
+        super().__init__(**kwargs)
+
+    def save(self, name, content, max_length=None):
+        data = normalize_image(content)
+        if data is not None:
+            content = ContentFile(data, name=name)
+        return super().save(name, content, max_length=max_length)
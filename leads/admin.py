@@ -1,7 +1,9 @@
+from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 
+from .holds import can_move_hold, hold_seats_count, soft_delete as soft_delete_applications, update_status
 from .models import Application, ApplicationAttachment, ContactMessage
 
 
@@ -23,30 +25,36 @@ def restore(modeladmin, request, queryset):
     queryset.update(is_deleted=False, is_active=True)
 
 
+# --- Application uchun: o‘rinlar (leads.holds) ham qaytariladi ---
+@admin.action(description="Soft delete (o‘chirish)")
+def app_soft_delete(modeladmin, request, queryset):
+    soft_delete_applications(queryset)
+
+
 # --- STATUS actions (Application uchun) ---
 @admin.action(description="Holatni: Yangi")
 def mark_new(modeladmin, request, queryset):
-    queryset.update(status="new")
+    update_status(queryset, "new")
 
 @admin.action(description="Holatni: Ko‘rib chiqilmoqda")
 def mark_in_review(modeladmin, request, queryset):
-    queryset.update(status="in_review")
+    update_status(queryset, "in_review")
 
 @admin.action(description="Holatni: Aloqa qilindi")
 def mark_contacted(modeladmin, request, queryset):
-    queryset.update(status="contacted")
+    update_status(queryset, "contacted")
 
 @admin.action(description="Holatni: Sotildi / band qilindi")
 def mark_won(modeladmin, request, queryset):
-    queryset.update(status="won")
+    update_status(queryset, "won")
 
 @admin.action(description="Holatni: Yo‘qotildi")
 def mark_lost(modeladmin, request, queryset):
-    queryset.update(status="lost")
+    update_status(queryset, "lost")
 
 @admin.action(description="Holatni: Spam")
 def mark_spam(modeladmin, request, queryset):
-    queryset.update(status="spam")
+    update_status(queryset, "spam")
 
 
 # --- STATUS actions (ContactMessage uchun) ---
@@ -94,8 +102,28 @@ class HasBudgetFilter(admin.SimpleListFilter):
 
 
 # ---------------- Application Admin ----------------
+class ApplicationAdminForm(forms.ModelForm):
+    class Meta:
+        model = Application
+        fields = "__all__"
+
+    def clean(self):
+        cleaned = super().clean()
+        departure = cleaned.get("departure")
+        if self.instance.pk and "departure" in self.changed_data and departure is not None:
+            tour = cleaned.get("tour")
+            if tour is not None and tour.pk != departure.tour_id:
+                self.add_error("departure", "Bu jo‘nash tanlangan turga tegishli emas.")
+            # clean() da self.instance hali DB dagi holatda
+            seats = hold_seats_count(cleaned.get("adults"), cleaned.get("children"))
+            if not can_move_hold(self.instance, departure, seats):
+                self.add_error("departure", "Bu jo‘nashda yetarli bo‘sh o‘rin yo‘q.")
+        return cleaned
+
+
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
+    form = ApplicationAdminForm
     inlines = [ApplicationAttachmentInline]
 
     def get_queryset(self, request):
@@ -117,14 +145,15 @@ class ApplicationAdmin(admin.ModelAdmin):
         HasBudgetFilter, "tour",  "is_active",
     )
     search_fields = ("^full_name", "^phone", "^email", "alt_destination", "tour__title", "message")
-    autocomplete_fields = ("tour", "country", "city", "assigned_to")
-    readonly_fields = ("created_at", "updated_at")
+    autocomplete_fields = ("tour", "country", "city", "assigned_to", "departure")
+    # o‘rinlar leads.holds orqali boshqariladi — qo‘lda tahrirlanmaydi (jo‘nash o‘zgarsa hold ko‘chadi)
+    readonly_fields = ("created_at", "updated_at", "seats_reserved", "hold_expires_at")
     ordering = ("-created_at",)
     list_per_page = 50
     save_on_top = True
     date_hierarchy = "created_at"
     actions = [
-        make_active, make_inactive, soft_delete, restore,
+        make_active, make_inactive, app_soft_delete, restore,
         mark_new, mark_in_review, mark_contacted, mark_won, mark_lost, mark_spam,
     ]
 
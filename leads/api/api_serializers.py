@@ -1,5 +1,10 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from leads.holds import hold_seats_count, place_hold
 from leads.models import Application, ApplicationAttachment, ContactMessage
+from tours.inventory import SeatsUnavailable
+from tours.models import TourDeparture
 
 class ApplicationAttachmentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -8,12 +13,17 @@ class ApplicationAttachmentSerializer(serializers.ModelSerializer):
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     attachments = ApplicationAttachmentSerializer(many=True, write_only=True, required=False)
+    # aniq jo‘nash: adults + children o‘rin darhol band qilinadi (leads.holds)
+    departure = serializers.PrimaryKeyRelatedField(
+        queryset=TourDeparture.objects.filter(is_active=True, is_deleted=False),
+        required=False, allow_null=True,
+    )
 
     class Meta:
         model = Application
         fields = [
             "full_name", "phone", "email", "country", "city", "preferred_contact",
-            "tour", "alt_destination", "desired_start_date", "days",
+            "tour", "departure", "alt_destination", "desired_start_date", "days",
             "adults", "children", "infants",
             "currency", "budget_from", "budget_to",
             "message",
@@ -21,16 +31,35 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
             "attachments",
         ]
 
+    def validate(self, attrs):
+        departure = attrs.get("departure")
+        if departure is not None:
+            if attrs.get("tour") and attrs["tour"].pk != departure.tour_id:
+                raise serializers.ValidationError({"departure": "Bu jo‘nash tanlangan turga tegishli emas."})
+            if departure.start_date < timezone.localdate():
+                raise serializers.ValidationError({"departure": "Bu jo‘nash sanasi o‘tib ketgan."})
+            attrs["tour"] = departure.tour
+            attrs.setdefault("desired_start_date", departure.start_date)
+        return attrs
+
     def create(self, validated_data):
         files = validated_data.pop("attachments", [])
+        departure = validated_data.pop("departure", None)
         request = self.context.get("request")
         # texnik izlar
         validated_data["client_ip"] = request.META.get("REMOTE_ADDR")
         validated_data["user_agent"] = request.META.get("HTTP_USER_AGENT")
         validated_data["referrer"] = request.META.get("HTTP_REFERER", "")
-        obj = Application.objects.create(**validated_data)
-        for f in files:
-            ApplicationAttachment.objects.create(application=obj, **f)
+        with transaction.atomic():
+            if departure is not None:
+                seats = hold_seats_count(validated_data.get("adults", 1), validated_data.get("children", 0))
+                try:
+                    validated_data.update(place_hold(departure, seats))
+                except SeatsUnavailable:
+                    raise serializers.ValidationError({"departure": "Bu jo‘nashda yetarli bo‘sh o‘rin yo‘q."})
+            obj = Application.objects.create(**validated_data)
+            for f in files:
+                ApplicationAttachment.objects.create(application=obj, **f)
         return obj
 
 class ContactMessageCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,124 @@
+# leads/holds.py
+"""
+Ariza bo‘yicha jo‘nashdagi o‘rinlarni vaqtincha band qilish (hold).
+
+- ariza departure bilan kelsa: o‘rinlar darhol olinadi (tours.inventory.take_seats),
+  hold SEAT_HOLD_MINUTES dan keyin tugaydi
+- "won"  — hold tasdiqlanadi (muddati olib tashlanadi, o‘rinlar qaytmaydi)
+- "lost" / "spam" yoki ariza o‘chirilsa (soft delete ham) — o‘rinlar qaytariladi;
+  tiklanganda (restore) hold qayta olinmaydi
+- ariza boshqa jo‘nashga ko‘chirilsa — eski o‘rinlar qaytadi, faol hold yangi jo‘nashda olinadi
+- muddati o‘tgan hold'lar: shu jo‘nashga yangi band qilishdan oldin va
+  `python manage.py release_expired_holds` (cron) orqali qaytariladi
+
+Ariza qatoridagi seats_reserved ham shartli UPDATE bilan nolga tushiriladi — bir hold ikki marta qaytarilmaydi.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tours.inventory import return_seats, take_seats
+
+from .models import Application
+
+RELEASE_STATUSES = ("lost", "spam")
+CONFIRM_STATUSES = ("won",)
+
+
+def hold_seats_count(adults, children) -> int:
+    # chaqaloqlar alohida o‘rin egallamaydi
+    return (adults or 0) + (children or 0)
+
+
+def place_hold(departure, seats: int) -> dict:
+    """
+    O‘rinlarni oladi va Application uchun maydonlarni qaytaradi.
+    Chaqiruvchi tranzaksiya ichida bo‘lishi kerak: ariza saqlanmasa, o‘rinlar ham qaytadi.
+    """
+    release_expired_holds(departure_id=departure.pk)
+    taken = take_seats(departure.pk, seats)
+    expires = timezone.now() + timedelta(minutes=settings.SEAT_HOLD_MINUTES) if taken else None
+    return {"departure": departure, "seats_reserved": taken, "hold_expires_at": expires}
+
+
+def release_hold(application) -> int:
+    reserved = application.seats_reserved
+    if reserved:
+        claimed = Application.objects.filter(pk=application.pk, seats_reserved=reserved).update(
+            seats_reserved=0, hold_expires_at=None
+        )
+        if claimed:
+            return_seats(application.departure_id, reserved)
+        else:
+            reserved = 0
+    application.seats_reserved = 0
+    application.hold_expires_at = None
+    return reserved
+
+
+def confirm_hold(application) -> None:
+    if application.seats_reserved:
+        Application.objects.filter(pk=application.pk).update(hold_expires_at=None)
+    application.hold_expires_at = None
+
+
+def move_hold(application, previous) -> None:
+    """
+    Ariza (application) boshqa jo‘nashga ko‘chirilganda: previous — DB dagi eski holat.
+    Eski jo‘nash o‘rinlari qaytadi; faol hold bo‘lgan bo‘lsa, yangi jo‘nashda olinadi
+    (won'da tasdiqlangan holda). Yetmasa — SeatsUnavailable, qaytarish ham bekor bo‘ladi.
+    """
+    with transaction.atomic():
+        released = release_hold(previous)
+        application.seats_reserved = 0
+        application.hold_expires_at = None
+        if released and application.departure_id:
+            hold = place_hold(application.departure, hold_seats_count(application.adults, application.children))
+            application.seats_reserved = hold["seats_reserved"]
+            application.hold_expires_at = hold["hold_expires_at"]
+            if application.status in CONFIRM_STATUSES:
+                application.hold_expires_at = None
+
+
+def can_move_hold(previous, departure, seats: int) -> bool:
+    """Admin formasi uchun oldindan tekshiruv: yangi jo‘nashda yetarli o‘rin bormi (o‘rinni olmaydi)."""
+    if not previous.seats_reserved or departure is None or departure.seats_left is None:
+        return True
+    return departure.seats_left >= seats
+
+
+def apply_status(application, status: str) -> None:
+    if status in RELEASE_STATUSES:
+        release_hold(application)
+    elif status in CONFIRM_STATUSES:
+        confirm_hold(application)
+
+
+def update_status(queryset, status: str) -> int:
+    """Admin action'lari uchun: queryset.update(status=...) + hold'lar (update() pre_save'ni chaqirmaydi)."""
+    with transaction.atomic():
+        if status in RELEASE_STATUSES + CONFIRM_STATUSES:
+            for application in queryset.filter(seats_reserved__gt=0).only("pk", "departure_id", "seats_reserved"):
+                apply_status(application, status)
+        return queryset.update(status=status)
+
+
+def soft_delete(queryset) -> int:
+    """Admin soft delete action'i uchun: queryset.update(is_deleted=True) + o‘rinlarni qaytarish."""
+    with transaction.atomic():
+        for application in queryset.filter(seats_reserved__gt=0).only("pk", "departure_id", "seats_reserved"):
+            release_hold(application)
+        return queryset.update(is_deleted=True, is_active=False)
+
+
+def release_expired_holds(departure_id=None, now=None) -> int:
+    """Muddati o‘tgan (tasdiqlanmagan) hold'larni qaytaradi. Qaytaradi: bo‘shagan o‘rinlar soni."""
+    expired = Application.objects.filter(seats_reserved__gt=0, hold_expires_at__lt=now or timezone.now())
+    if departure_id is not None:
+        expired = expired.filter(departure_id=departure_id)
+    released = 0
+    for application in expired.only("pk", "departure_id", "seats_reserved"):
+        released += release_hold(application)
+    return released
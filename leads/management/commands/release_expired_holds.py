@@ -0,0 +1,12 @@
+# leads/management/commands/release_expired_holds.py
+from django.core.management.base import BaseCommand
+
+from leads.holds import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Return seats held by applications whose hold has expired (run from cron)."
+
+    def handle(self, *args, **opts):
+        released = release_expired_holds()
+        self.stdout.write(self.style.SUCCESS(f"Done. released_seats={released}"))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0001_initial'),
+        ('tours', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='departure',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='tours.tourdeparture', verbose_name='Jo‘nash'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='hold_expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text="Shu vaqtgacha 'won' bo‘lmasa o‘rinlar qaytariladi.", null=True, verbose_name='Band muddati'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='seats_reserved',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Jo‘nashdan olingan o‘rinlar; lost/spam bo‘lsa qaytariladi.', verbose_name='Band qilingan o‘rinlar'),
+        ),
+    ]
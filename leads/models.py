@@ -5,7 +5,7 @@ from django.contrib.auth import get_user_model
 
 from common.models import BaseModel
 from locations.models import Country, City
-from tours.models import Tour
+from tours.models import Tour, TourDeparture
 
 User = get_user_model()
 
@@ -71,6 +71,19 @@ class Application(BaseModel):
     desired_start_date = models.DateField(
         _("Boshlanish sanasi"), null=True, blank=True
     )
+    # Aniq jo‘nash tanlangan bo‘lsa — o‘rinlar vaqtincha band qilinadi (leads.holds)
+    departure = models.ForeignKey(
+        TourDeparture, on_delete=models.SET_NULL, null=True, blank=True,
+        verbose_name=_("Jo‘nash"), related_name="applications"
+    )
+    seats_reserved = models.PositiveSmallIntegerField(
+        _("Band qilingan o‘rinlar"), default=0,
+        help_text=_("Jo‘nashdan olingan o‘rinlar; lost/spam bo‘lsa qaytariladi.")
+    )
+    hold_expires_at = models.DateTimeField(
+        _("Band muddati"), null=True, blank=True, db_index=True,
+        help_text=_("Shu vaqtgacha 'won' bo‘lmasa o‘rinlar qaytariladi.")
+    )
     days = models.PositiveSmallIntegerField(
         _("Necha kun"), null=True, blank=True, validators=[MinValueValidator(1)]
     )
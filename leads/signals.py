@@ -3,9 +3,10 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils.html import escape
 from django.utils.translation import gettext as _
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, pre_delete
 
 from .models import Application, ContactMessage
+from .holds import apply_status, move_hold, release_hold
 from .notifications import email_notify, telegram_notify
 
 
@@ -87,8 +88,27 @@ def on_application_status_changed(sender, instance: Application, **kwargs):
         old = Application.objects.get(pk=instance.pk)
     except Application.DoesNotExist:
         return
+    # hold maydonlarini faqat leads.holds boshqaradi — eski forma qiymati DB dagini bosib ketmasin
+    instance.seats_reserved = old.seats_reserved
+    instance.hold_expires_at = old.hold_expires_at
+    if instance.is_deleted and not old.is_deleted:
+        # soft delete — o‘rinlar eski (DB dagi) jo‘nashga qaytadi
+        release_hold(old)
+        instance.seats_reserved = 0
+        instance.hold_expires_at = None
+    elif instance.departure_id != old.departure_id:
+        move_hold(instance, old)
     if old.status != instance.status:
+        # lost/spam — o‘rinlar qaytadi, won — hold tasdiqlanadi
+        apply_status(instance, instance.status)
         # subject = f"🔄 Application status o'zgardi: {old.get_status_display()} → {instance.get_status_display()}"
         msg = f"{instance.full_name} / {getattr(instance.tour, 'title', None) or '—'}"
         # email_notify(subject, msg)
         telegram_notify(f"🔄 Ariza status: {old.get_status_display()} → {instance.get_status_display()}\n{msg}")
+
+
+@receiver(pre_delete, sender=Application)
+def on_application_deleting(sender, instance: Application, **kwargs):
+    # pre_delete: release_hold ariza qatorini shartli UPDATE bilan "egallaydi" — qator hali bo‘lishi kerak
+    if instance.seats_reserved:
+        release_hold(instance)
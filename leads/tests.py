@@ -1,3 +1,160 @@
-from django.test import TestCase
+import datetime
+import threading
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from leads.holds import soft_delete
+from leads.models import Application
+from tours.inventory import SeatsUnavailable
+from tours.models import Tour, TourCategory, TourDeparture
+
+APPLICATION_URL = "/api/v1/leads/application/"
+
+
+@override_settings(
+    TELEGRAM_BOT_TOKEN="",
+    BACKGROUND_TASKS_SYNC=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class SeatHoldTests(TransactionTestCase):
+    """
+    leads.holds: o‘rinlar shartli UPDATE bilan olinadi — parallel arizalar oxirgi o‘rinni ikki marta ololmaydi;
+    lost/spam, o‘chirish yoki soft delete'da qaytariladi, won'da tasdiqlanadi;
+    boshqa jo‘nashga ko‘chirilganda hold ham ko‘chadi.
+    TransactionTestCase: thread'lar alohida ulanish bilan haqiqiy commit ko‘radi.
+    """
+
+    def setUp(self):
+        cache.clear()  # ariza throttle hisoblagichi testlar orasida yig‘ilmasin
+        category = TourCategory.objects.create(name="Cat", slug="cat")
+        self.tour = Tour.objects.create(title="Tour", category=category, days=3, base_price=Decimal("100"))
+        start = timezone.localdate() + datetime.timedelta(days=30)
+        self.departure = TourDeparture.objects.create(
+            tour=self.tour, start_date=start, end_date=start + datetime.timedelta(days=3),
+            seats_total=4, seats_left=1,
+        )
+
+    def apply(self, name="Guest", adults=1):
+        return APIClient(HTTP_HOST="localhost", HTTP_USER_AGENT="tests").post(APPLICATION_URL, {
+            "full_name": name, "phone": "+998901234567",
+            "departure": self.departure.pk, "adults": adults, "children": 0,
+        }, format="json")
+
+    def seats_left(self):
+        self.departure.refresh_from_db()
+        return self.departure.seats_left
+
+    def test_two_holds_race_for_last_seat(self):
+        barrier = threading.Barrier(2)
+        statuses = []
+
+        def worker(name):
+            try:
+                barrier.wait()
+                statuses.append(self.apply(name).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(f"Guest {i}",)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [201, 400])
+        self.assertEqual(self.seats_left(), 0)
+        self.assertEqual(Application.objects.filter(seats_reserved=1).count(), 1)
+
+    def test_sold_out_departure_rejects_hold(self):
+        self.assertEqual(self.apply(adults=2).status_code, 400)
+        self.assertEqual(self.seats_left(), 1)
+        self.assertFalse(Application.objects.exists())
+
+    def assert_status_releases(self, status):
+        self.assertEqual(self.apply().status_code, 201)
+        self.assertEqual(self.seats_left(), 0)
+        application = Application.objects.get()
+        application.status = status
+        application.save()
+        application.refresh_from_db()
+        self.assertEqual(application.seats_reserved, 0)
+        self.assertIsNone(application.hold_expires_at)
+        self.assertEqual(self.seats_left(), 1)
+        # qayta saqlash o‘rinlarni ikkinchi marta qaytarmaydi
+        application.save()
+        self.assertEqual(self.seats_left(), 1)
+
+    def test_lost_releases_seats(self):
+        self.assert_status_releases("lost")
+
+    def test_spam_releases_seats(self):
+        self.assert_status_releases("spam")
+
+    def test_delete_releases_seats(self):
+        self.assertEqual(self.apply().status_code, 201)
+        Application.objects.get().delete()
+        self.assertEqual(self.seats_left(), 1)
+
+    def test_soft_delete_releases_seats(self):
+        self.assertEqual(self.apply().status_code, 201)
+        application = Application.objects.get()
+        application.soft_delete()
+        application.refresh_from_db()
+        self.assertEqual(application.seats_reserved, 0)
+        self.assertEqual(self.seats_left(), 1)
+        # qayta soft delete o‘rinlarni ikkinchi marta qaytarmaydi
+        application.soft_delete()
+        self.assertEqual(self.seats_left(), 1)
+
+    def test_soft_delete_action_releases_seats(self):
+        self.assertEqual(self.apply().status_code, 201)
+        soft_delete(Application.objects.all())
+        self.assertTrue(Application.objects.get().is_deleted)
+        self.assertEqual(self.seats_left(), 1)
+
+    def add_departure(self, seats_left):
+        start = self.departure.start_date + datetime.timedelta(days=7)
+        return TourDeparture.objects.create(
+            tour=self.tour, start_date=start, end_date=start + datetime.timedelta(days=3),
+            seats_total=4, seats_left=seats_left,
+        )
+
+    def test_departure_change_moves_hold(self):
+        other = self.add_departure(seats_left=2)
+        self.assertEqual(self.apply().status_code, 201)
+        application = Application.objects.get()
+        application.departure = other
+        application.save()
+        application.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(application.seats_reserved, 1)
+        self.assertIsNotNone(application.hold_expires_at)
+        self.assertEqual(self.seats_left(), 1)
+        self.assertEqual(other.seats_left, 1)
+
+    def test_departure_change_to_sold_out_keeps_hold(self):
+        other = self.add_departure(seats_left=0)
+        self.assertEqual(self.apply().status_code, 201)
+        application = Application.objects.get()
+        application.departure = other
+        with self.assertRaises(SeatsUnavailable):
+            application.save()
+        application.refresh_from_db()
+        self.assertEqual(application.departure_id, self.departure.pk)
+        self.assertEqual(application.seats_reserved, 1)
+        self.assertEqual(self.seats_left(), 0)
+
+    def test_won_confirms_hold(self):
+        self.assertEqual(self.apply().status_code, 201)
+        application = Application.objects.get()
+        application.status = "won"
+        application.save()
+        application.refresh_from_db()
+        self.assertEqual(application.seats_reserved, 1)
+        self.assertIsNone(application.hold_expires_at)
+        self.assertEqual(self.seats_left(), 0)
@@ -0,0 +1,45 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core.geo import bbox_q, distance_expression, parse_point
+
+
+class NearFilter(BaseFilterBackend):
+    """
+    ?near=lat,lng&radius_km=50 — radius ichidagilar, masofa bo‘yicha (yaqinidan) tartiblanadi,
+    natijada `distance_km` annotatsiyasi. Avval lat/lng indeksi bo‘yicha bbox, haversine faqat
+    shu nomzodlarga hisoblanadi — City jadvali to‘liq skanerlanmaydi.
+    """
+    near_param = "near"
+    radius_param = "radius_km"
+    default_radius_km = 50
+    max_radius_km = 2000
+
+    def get_near(self, request):
+        value = request.query_params.get(self.near_param)
+        if not value:
+            return None
+        try:
+            lat, lng = parse_point(value)
+        except ValueError:
+            raise ValidationError({self.near_param: "lat,lng ko‘rinishida bo‘lishi kerak."})
+        try:
+            radius = float(request.query_params.get(self.radius_param) or self.default_radius_km)
+        except ValueError:
+            raise ValidationError({self.radius_param: "Son bo‘lishi kerak."})
+        if not 0 < radius <= self.max_radius_km:
+            raise ValidationError({self.radius_param: f"0 dan katta, {self.max_radius_km} dan oshmasin."})
+        return lat, lng, radius
+
+    def filter_queryset(self, request, queryset, view):
+        near = self.get_near(request)
+        if near is None:
+            return queryset
+        return self.filter_near(queryset, *near).order_by("distance_km")
+
+    def filter_near(self, queryset, lat, lng, radius_km):
+        return (
+            queryset.filter(bbox_q(lat, lng, radius_km))
+            .annotate(distance_km=distance_expression(lat, lng))
+            .filter(distance_km__lte=radius_km)
+        )
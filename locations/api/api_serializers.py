@@ -8,6 +8,9 @@ class CountrySerializer(serializers.ModelSerializer):
 
 class CitySerializer(serializers.ModelSerializer):
     country = CountrySerializer(read_only=True)
+    # ?near= bilan (NearFilter annotatsiyasi)
+    distance_km = serializers.FloatField(read_only=True, default=None)
     class Meta:
         model = City
-        fields = ["id", "name", "ascii_name", "country", "admin1", "tz", "population", "lat", "lng", "geoname_id"]
+        fields = ["id", "name", "ascii_name", "country", "admin1", "tz", "population", "lat", "lng", "geoname_id",
+                  "distance_km"]
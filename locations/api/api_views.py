@@ -1,11 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from core.conditional import ConditionalGetMixin
 from locations.models import Country, City
+from .api_filters import NearFilter
 from .api_serializers import CountrySerializer, CitySerializer
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Country.objects.filter(is_active=True)
     serializer_class = CountrySerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -13,10 +15,12 @@ class CountryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ["name", "region", "subregion"]
 
 
-class CityViewSet(viewsets.ReadOnlyModelViewSet):
+class CityViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = City.objects.filter(is_active=True).select_related("country")
     serializer_class = CitySerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    conditional_related = ("country",)
+    # ?near=lat,lng&radius_km= — masofa bo‘yicha; ?ordering= berilsa u ustun
+    filter_backends = [DjangoFilterBackend, SearchFilter, NearFilter, OrderingFilter]
     filterset_fields = ["country"]  # ?country=<id>
     search_fields = ["^name", "ascii_name", "admin1"]
     ordering_fields = ["population", "name"]
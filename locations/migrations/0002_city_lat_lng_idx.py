@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='city',
+            index=models.Index(fields=['lat', 'lng'], name='city_lat_lng_idx'),
+        ),
+    ]
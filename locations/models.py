@@ -41,6 +41,8 @@ class City(BaseModel):
             models.Index(fields=["name"]),
             models.Index(fields=["country", "name"]),
             models.Index(fields=["-population"]),
+            # ?near= bbox oldindan saralash (locations.api.api_filters.NearFilter)
+            models.Index(fields=["lat", "lng"], name="city_lat_lng_idx"),
         ]
         ordering = ["-population", "name"]
 
@@ -1,19 +1,57 @@
+from django.db.models import Count, Max, Prefetch, prefetch_related_objects
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from siteinfo.models import SiteSettings, AboutPage, ContactPage
+
+from core.conditional import make_etag, respond_conditionally, latest
+from core.i18n import lang
+from siteinfo.models import SiteSettings, AboutPage, AboutSection, ContactPage
 from .api_serializers import SiteSettingsSerializer, AboutPageSerializer, ContactPageSerializer
 
+
+def _children_stamps(obj, *relations):
+    """
+    Nested bo‘limlar uchun validator qismlari: har bir relation bo‘yicha max(updated_at) va soni
+    (o‘chirilgan yozuv max'ni o‘zgartirmaydi, soni esa o‘zgartiradi).
+    """
+    if not relations:
+        return [], []
+    aggregates = {}
+    for rel in relations:
+        aggregates[f"{rel}__last"] = Max(f"{rel}__updated_at")
+        aggregates[f"{rel}__total"] = Count(rel, distinct=True)
+    stats = type(obj).objects.filter(pk=obj.pk).aggregate(**aggregates)
+    stamps = [stats[f"{rel}__last"] for rel in relations]
+    totals = [stats[f"{rel}__total"] for rel in relations]
+    return stamps, totals
+
+
+def conditional_singleton(request, obj, serializer_class, relations=()):
+    stamps, totals = _children_stamps(obj, *relations)
+    last_modified = latest(obj.updated_at, *stamps)
+    etag = make_etag(type(obj).__name__, lang(), last_modified, *totals)
+    # bola yozuv o‘chirilsa max(updated_at) kamayishi mumkin — Last-Modified faqat ETag'siz ishonchli emas,
+    # shuning uchun relation'li javoblarda u yuborilmaydi (validator — soni ham kirgan ETag)
+    return respond_conditionally(
+        request, etag, None if relations else last_modified, lambda: Response(serializer_class(obj).data)
+    )
+
+
 class SiteSettingsView(APIView):
     def get(self, request):
         data = SiteSettings.get_solo()
-        return Response(SiteSettingsSerializer(data).data)
+        return conditional_singleton(
+            request, data, SiteSettingsSerializer,
+            relations=("contacts", "socials", "locations", "locations__hours"),
+        )
 
 class AboutPageView(APIView):
     def get(self, request):
         data = AboutPage.get_solo()
-        return Response(AboutPageSerializer(data).data)
+        # bo‘lim matnlari (body_*) — faqat aktiv til (+fallback)
+        prefetch_related_objects([data], Prefetch("sections", queryset=AboutSection.objects.for_language()))
+        return conditional_singleton(request, data, AboutPageSerializer, relations=("sections",))
 
 class ContactPageView(APIView):
     def get(self, request):
-        data = ContactPage.get_solo()
-        return Response(ContactPageSerializer(data).data)
+        data = ContactPage.get_solo_for_language()
+        return conditional_singleton(request, data, ContactPageSerializer)
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
 from common.models import BaseModel
+from core.i18n import LanguageScopedQuerySet
 from locations.models import Country, City
 
 
@@ -363,6 +364,8 @@ class AboutSection(BaseModel):
         _("Tartib"), default=0, db_index=True
     )
 
+    objects = LanguageScopedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Bo‘lim")
         verbose_name_plural = _("Bo‘limlar")
@@ -401,6 +404,8 @@ class ContactPage(BaseModel):
         _("Meta tavsif"), max_length=255, blank=True
     )
 
+    objects = LanguageScopedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Aloqa (sahifa)")
         verbose_name_plural = _("Aloqa (sahifa)")
@@ -412,3 +417,8 @@ class ContactPage(BaseModel):
     def get_solo(cls):
         obj, _ = cls.objects.get_or_create(singleton_key="contact", defaults={"is_active": True})
         return obj
+
+    @classmethod
+    def get_solo_for_language(cls):
+        """API uchun: faqat aktiv til (+fallback) matnlari yuklanadi; o‘qish uchun, saqlanmaydi."""
+        return cls.objects.for_language().filter(singleton_key="contact").first() or cls.get_solo()
@@ -3,15 +3,16 @@ from decimal import Decimal, InvalidOperation
 
 from django import forms
 from django.contrib import admin
-from django.db.models import Prefetch
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 from modeltranslation.admin import TabbedTranslationAdmin, TranslationTabularInline
 from django_ckeditor_5.widgets import CKEditor5Widget
 
+from core.images import variant_url
+
 from .models import (
     TourCategory, TourTag, Tour,
-    TourStop, ItineraryDay, TourImage, TourVideo, TourDeparture
+    TourStop, ItineraryDay, TourImage, TourVideo, TourDeparture, ExchangeRate
 )
 
 
@@ -74,10 +75,11 @@ class HasCoverFilter(admin.SimpleListFilter):
         return (("yes", "Bor"), ("no", "Yo‘q"))
     def queryset(self, request, qs):
         v = self.value()
+        # Tour.cover is_cover belgilangan rasmni birinchi tanlaydi — JOIN bitta qator
         if v == "yes":
-            return qs.filter(images__is_cover=True).distinct()
+            return qs.filter(cover__is_cover=True)
         if v == "no":
-            return qs.exclude(images__is_cover=True).distinct()
+            return qs.exclude(cover__is_cover=True)
         return qs
 
 
@@ -203,10 +205,7 @@ class TourAdmin(TabbedTranslationAdmin, admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related("category").prefetch_related(
-            Prefetch("images", queryset=TourImage.objects.order_by("order", "id")),
-            "tags",
-        )
+        return qs.select_related("category", "cover").prefetch_related("tags")
 
     list_display = (
         "cover_thumb", "title", "category", "days", "group_range",
@@ -218,26 +217,22 @@ class TourAdmin(TabbedTranslationAdmin, admin.ModelAdmin):
     search_fields = ("^title", "^slug", "short_description", "long_description")
     autocomplete_fields = ("category", "tags")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("route_distance_km", "created_at", "updated_at")
     ordering = ("order", "-created_at")
     actions = [make_published, make_archived, set_featured, unset_featured]
     list_per_page = 50
     save_on_top = True
-    list_select_related = ("category",)
+    list_select_related = ("category", "cover")
 
     @admin.display(description="Cover")
     def cover_thumb(self, obj):
-        img = next((im for im in obj.images.all() if im.is_cover), None)
-        if not img:
-            # birinchi rasmga fallback
-            imgs = list(obj.images.all())
-            img = imgs[0] if imgs else None
+        img = obj.cover  # is_cover, bo‘lmasa birinchi rasm
         if not img:
             return "—"
         try:
             return format_html(
                 '<img src="{}" style="height:40px;border-radius:6px;object-fit:cover;">',
-                img.image.url
+                variant_url(img.image, img.image_variants, "thumb")
             )
         except Exception:
             return "—"
@@ -246,7 +241,7 @@ class TourAdmin(TabbedTranslationAdmin, admin.ModelAdmin):
     def group_range(self, obj):
         return f"{obj.min_group}–{obj.max_group}"
 
-    @admin.display(description="Narx", ordering="base_price")
+    @admin.display(description="Narx", ordering="effective_price")
     def price_display(self, obj):
         base_str = _fmt_money(obj.base_price)
         # price_after_discount property qaytaradigan qiymatni ham formatlaymiz:
@@ -306,7 +301,10 @@ class TourImageAdmin(admin.ModelAdmin):
     @admin.display(description="Preview")
     def thumb(self, obj):
         try:
-            return format_html('<img src="{}" style="height:40px;border-radius:6px;">', obj.image.url)
+            return format_html(
+                '<img src="{}" style="height:40px;border-radius:6px;">',
+                variant_url(obj.image, obj.image_variants, "thumb"),
+            )
         except Exception:
             return "—"
 
@@ -327,3 +325,10 @@ class TourDepartureAdmin(admin.ModelAdmin):
     autocomplete_fields = ("tour",)
     ordering = ("tour", "start_date")
     list_per_page = 50
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    # 1 BASE_CURRENCY = rate; saqlansa turlarning base narxi qayta hisoblanadi (signals)
+    list_display = ("currency", "rate", "updated_at")
+    search_fields = ("^currency",)
+    ordering = ("currency",)
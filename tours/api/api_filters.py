@@ -1,18 +1,186 @@
 import django_filters as df
-from tours.models import Tour
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+from core.geo import bbox_q, distance_expression
+from locations.api.api_filters import NearFilter
+from tours.models import ExchangeRate, Tour, TourDeparture, TourStop
+from tours.search import get_backend as get_search_backend
+
+# ?tag=1,2,3 kabi ro‘yxatlarda qiymatlar soni (EXISTS'lar soni) cheklangan
+MAX_MULTI_VALUES = 20
+
+
+def related_exists(model, path: str, value):
+    """
+    Ko‘p qiymatli bog‘lanish (M2M yoki teskari FK) bo‘yicha shartni korrelyatsiyalangan
+    EXISTS ga aylantiradi: asosiy so‘rov JOIN qilmaydi, qatorlar ko‘paymaydi, .distinct() kerak emas.
+      related_exists(Tour, "tags__name__icontains", "tog‘")
+      related_exists(Tour, "tour_stops__country_id__in", [1, 2])
+    """
+    first, rest = path.split("__", 1)
+    field = model._meta.get_field(first)
+    if field.many_to_many and not field.auto_created:
+        # to‘g‘ridan-to‘g‘ri through jadval: tours_tour_tags(tour_id, tourtag_id)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        if rest in ("id", "pk") or rest.startswith(("id__", "pk__")):
+            rest = f"{target}_id{rest[2:]}"
+        else:
+            rest = f"{target}__{rest}"
+        subquery = through.objects.filter(**{f"{source}_id": OuterRef("pk"), rest: value})
+    elif field.one_to_many:
+        subquery = field.related_model._base_manager.filter(**{field.field.name: OuterRef("pk"), rest: value})
+    else:
+        raise ValueError(f"{model.__name__}.{first} is not a multi-valued relation")
+    return Exists(subquery)
+
+
+def requested_currency(request) -> tuple:
+    """?currency=EUR -> ("EUR", 1 BASE_CURRENCY necha EUR); berilmasa (None, None). Kursi yo‘q valyuta — 400."""
+    code = (request.query_params.get("currency") or "").strip().upper() if request is not None else ""
+    if not code:
+        return None, None
+    rate = ExchangeRate.objects.rates().get(code)
+    if rate is None:
+        raise ValidationError({"currency": f"Kurs mavjud emas: {code}."})
+    return code, rate
+
+
+class NumberInFilter(df.BaseInFilter, df.NumberFilter):
+    pass
+
+
+class PriceFilter(df.NumberFilter):
+    """
+    Qiymat ?currency= valyutasida (standart: BASE_CURRENCY) — base'ga o‘tkazilib,
+    indekslangan effective_price_base bo‘yicha solishtiriladi.
+    """
+
+    def filter(self, qs, value):
+        if value not in (None, ""):
+            _, rate = requested_currency(getattr(self.parent, "request", None))
+            if rate:
+                value = value / rate
+        return super().filter(qs, value)
+
 
 class TourFilter(df.FilterSet):
-    price_min = df.NumberFilter(field_name="price_after_discount", lookup_expr="gte")
-    price_max = df.NumberFilter(field_name="price_after_discount", lookup_expr="lte")
+    MATCH = (("any", "any"), ("all", "all"))
+
+    price_min = PriceFilter(field_name="effective_price_base", lookup_expr="gte")
+    price_max = PriceFilter(field_name="effective_price_base", lookup_expr="lte")
     days_min  = df.NumberFilter(field_name="days", lookup_expr="gte")
     days_max  = df.NumberFilter(field_name="days", lookup_expr="lte")
+    # marshrut uzunligi (km) — Tour.route_distance_km (tours.routes)
+    distance_min = df.NumberFilter(field_name="route_distance_km", lookup_expr="gte")
+    distance_max = df.NumberFilter(field_name="route_distance_km", lookup_expr="lte")
     category  = df.NumberFilter(field_name="category__id")
-    tag       = df.NumberFilter(field_name="tags__id")
-    country   = df.NumberFilter(field_name="tour_stops__country__id")
-    city      = df.NumberFilter(field_name="tour_stops__city__id")
+    tag       = NumberInFilter(method="filter_related", field_name="tags__id")
+    country   = NumberInFilter(method="filter_related", field_name="tour_stops__country_id")
+    city      = NumberInFilter(method="filter_related", field_name="tour_stops__city_id")
+    # ?tag=1,2,3&match=all — hammasi bo‘lishi shart; standart: any (kamida bittasi)
+    match     = df.ChoiceFilter(choices=MATCH, method="filter_noop")
     featured  = df.BooleanFilter(field_name="is_featured")
     status    = df.CharFilter(field_name="status")
+    # jo‘nash bo‘yicha: uchalasi bitta jo‘nashga qo‘llanadi (filter_queryset dagi bitta EXISTS)
+    departs_after  = df.DateFilter(method="filter_noop")
+    departs_before = df.DateFilter(method="filter_noop")
+    has_seats      = df.BooleanFilter(method="filter_noop")
 
     class Meta:
         model = Tour
         fields = []
+
+    def filter_noop(self, queryset, name, value):
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        data = self.form.cleaned_data
+        after, before, has_seats = data.get("departs_after"), data.get("departs_before"), data.get("has_seats")
+        if after is None and before is None and has_seats is None:
+            return queryset
+        departures = TourDeparture.objects.filter(
+            tour=OuterRef("pk"), is_active=True, is_deleted=False,
+            start_date__gte=max(after or timezone.localdate(), timezone.localdate()),
+        )
+        if before is not None:
+            departures = departures.filter(start_date__lte=before)
+        if has_seats is None:
+            return queryset.filter(Exists(departures))
+        # seats_left NULL — o‘rinlar hisoblanmaydi (cheklanmagan)
+        with_seats = departures.filter(Q(seats_left__gt=0) | Q(seats_left__isnull=True))
+        return queryset.filter(Exists(with_seats) if has_seats else ~Exists(with_seats))
+
+    def filter_related(self, queryset, name, value):
+        ids = list(dict.fromkeys(int(v) for v in value))[:MAX_MULTI_VALUES]
+        if not ids:
+            return queryset
+        if self.form.cleaned_data.get("match") == "all":
+            return queryset.filter(*(related_exists(Tour, name, pk) for pk in ids))
+        return queryset.filter(related_exists(Tour, f"{name}__in", ids))
+
+
+class TourSearchFilter(SearchFilter):
+    """
+    ?search= — to‘liq matnli indeks (tours.search) bo‘yicha: title/short/long description
+    (HTML'siz), teglar va kategoriya nomi, uchala tilda. Natijaga `search_rank` annotatsiyasi
+    qo‘shiladi; ?ordering berilmasa TourOrderingFilter shu bo‘yicha saralaydi.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        ids = get_search_backend().search(search_terms)
+        if not ids:
+            return queryset.none()
+        return queryset.filter(pk__in=ids).annotate(
+            search_rank=Case(
+                *(When(pk=pk, then=Value(rank)) for rank, pk in enumerate(ids)),
+                output_field=IntegerField(),
+            )
+        )
+
+
+class TourNearFilter(NearFilter):
+    """
+    ?near=lat,lng&radius_km= — marshrutidagi eng yaqin shahar (TourStop.city) radius ichida bo‘lgan turlar;
+    `distance_km` — shu shahargacha masofa. Bbox City(lat, lng) indeksi bo‘yicha, haversine faqat nomzod bekatlarga.
+    """
+
+    def filter_near(self, queryset, lat, lng, radius_km):
+        stops = (
+            TourStop.objects.filter(bbox_q(lat, lng, radius_km, prefix="city__"))
+            .annotate(distance=distance_expression(lat, lng, prefix="city__"))
+            .filter(distance__lte=radius_km)
+        )
+        nearest = stops.filter(tour=OuterRef("pk")).order_by("distance").values("distance")[:1]
+        return queryset.filter(Exists(stops.filter(tour=OuterRef("pk")))).annotate(distance_km=Subquery(nearest))
+
+
+class TourOrderingFilter(OrderingFilter):
+    """
+    ?ordering=price_after_discount — API nomi saqlanadi, lekin DB da indekslangan
+    effective_price_base ustuni (BASE_CURRENCY dagi narx) bo‘yicha saralanadi — valyutalar aralash bo‘lsa ham to‘g‘ri.
+    """
+    aliases = {"price_after_discount": "effective_price_base", "effective_price": "effective_price_base"}
+    # ?ordering berilmasa: ?near= — masofa, qidiruvda — relevantlik
+    rank_annotations = ("distance_km", "search_rank")
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param):
+            for rank in self.rank_annotations:
+                if rank in queryset.query.annotations:
+                    return [rank, *self.get_default_ordering(view)]
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        result = []
+        for term in ordering:
+            desc = term.startswith("-")
+            name = self.aliases.get(term.lstrip("-"), term.lstrip("-"))
+            result.append(f"-{name}" if desc else name)
+        return result
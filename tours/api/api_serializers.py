@@ -3,6 +3,16 @@ from tours.models import (
     TourCategory, TourTag, Tour, TourImage, TourVideo, ItineraryDay, TourStop, TourDeparture
 )
 from locations.api.api_serializers import CountrySerializer, CitySerializer
+from core.images import srcset
+from core.serializers import SparseFieldsMixin
+
+
+def image_srcset(serializer, field_file, variants) -> dict:
+    # ImageField kabi: request bo‘lsa — absolyut URL
+    if not field_file:
+        return {}
+    request = serializer.context.get("request")
+    return srcset(field_file.storage, variants, request.build_absolute_uri if request else None)
 
 
 class TourCategorySerializer(serializers.ModelSerializer):
@@ -17,10 +27,30 @@ class TourTagSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug"]
 
 
+class ImageMetaField(serializers.ReadOnlyField):
+    """image_variants JSON'dagi kalit: width / height / placeholder (fon ishida hisoblanadi, bo‘lmasa null)."""
+
+    def __init__(self, key, **kwargs):
+        self.key = key
+        kwargs.setdefault("source", "image_variants")
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return (value or {}).get(self.key)
+
+
 class TourImageSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+    width = ImageMetaField("width")
+    height = ImageMetaField("height")
+    placeholder = ImageMetaField("placeholder")
+
     class Meta:
         model = TourImage
-        fields = ["image", "alt", "is_cover", "order"]
+        fields = ["image", "srcset", "width", "height", "placeholder", "alt", "is_cover", "order"]
+
+    def get_srcset(self, obj):
+        return image_srcset(self, obj.image, obj.image_variants)
 
 
 class TourVideoSerializer(serializers.ModelSerializer):
@@ -30,9 +60,18 @@ class TourVideoSerializer(serializers.ModelSerializer):
 
 
 class ItineraryDaySerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+    image_width = ImageMetaField("width")
+    image_height = ImageMetaField("height")
+    image_placeholder = ImageMetaField("placeholder")
+
     class Meta:
         model = ItineraryDay
-        fields = ["day_number", "title", "description", "image"]
+        fields = ["day_number", "title", "description", "image", "srcset",
+                  "image_width", "image_height", "image_placeholder"]
+
+    def get_srcset(self, obj):
+        return image_srcset(self, obj.image, obj.image_variants)
 
 
 class TourStopSerializer(serializers.ModelSerializer):
@@ -47,31 +86,62 @@ class TourStopSerializer(serializers.ModelSerializer):
 class TourDepartureSerializer(serializers.ModelSerializer):
     class Meta:
         model = TourDeparture
-        fields = ["start_date", "end_date", "seats_total", "seats_left"]
+        fields = ["id", "start_date", "end_date", "seats_total", "seats_left"]
+
+
+class DisplayPriceMixin(serializers.Serializer):
+    # Tour.objects.with_display_price() annotatsiyalari (?currency=; bo‘lmasa — turning o‘z valyutasida)
+    display_price = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True, default=None)
+    display_currency = serializers.CharField(read_only=True, default=None)
 
 
-class TourListSerializer(serializers.ModelSerializer):
+class TourListSerializer(SparseFieldsMixin, DisplayPriceMixin, serializers.ModelSerializer):
     category = TourCategorySerializer(read_only=True)
     cover = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
+    cover_width = ImageMetaField("width", source="cover.image_variants", default=None)
+    cover_height = ImageMetaField("height", source="cover.image_variants", default=None)
+    cover_placeholder = ImageMetaField("placeholder", source="cover.image_variants", default=None)
+    # Tour.objects.with_departures() annotatsiyalari
+    next_departure = serializers.DateField(read_only=True, default=None)
+    seats_left = serializers.IntegerField(read_only=True, default=None)
+    # ?near= bilan (TourNearFilter annotatsiyasi)
+    distance_km = serializers.FloatField(read_only=True, default=None)
+    # faqat ?expand= bilan (masalan expand=departures)
+    tags = TourTagSerializer(read_only=True, many=True)
+    images = TourImageSerializer(read_only=True, many=True)
+    videos = TourVideoSerializer(read_only=True, many=True)
+    itinerary = ItineraryDaySerializer(read_only=True, many=True)
+    route = TourStopSerializer(source="tour_stops", read_only=True, many=True)
+    departures = TourDepartureSerializer(read_only=True, many=True)
 
     class Meta:
         model = Tour
         fields = ["id", "slug", "title", "category", "days", "base_price", "currency", 'short_description', 'min_group',
                   'max_group',
-                  "discount_percent", "discount_amount", "price_after_discount", "is_featured", "cover"]
+                  "discount_percent", "discount_amount", "price_after_discount",
+                  "display_price", "display_currency", "is_featured", "cover",
+                  "cover_srcset", "cover_width", "cover_height", "cover_placeholder",
+                  "next_departure", "seats_left", "distance_km", "route_distance_km", "route_geometry",
+                  "tags", "images", "videos", "itinerary", "route", "departures"]
+        # route_geometry — og‘ir (koordinatalar ro‘yxati), ro‘yxatda faqat ?fields= / ?expand= bilan
+        expandable_fields = ["tags", "images", "videos", "itinerary", "route", "departures", "route_geometry"]
 
     def get_cover(self, obj):
-        img = next((im for im in obj.images.all() if im.is_cover), None) or obj.images.first()
-        return img.image.url if img else None
+        # Tour.cover — oldindan tanlangan rasm (select_related("cover"))
+        return obj.cover.image.url if obj.cover else None
+
+    def get_cover_srcset(self, obj):
+        return image_srcset(self, obj.cover.image, obj.cover.image_variants) if obj.cover else {}
 
 
-class TourDetailSerializer(serializers.ModelSerializer):
+class TourDetailSerializer(SparseFieldsMixin, DisplayPriceMixin, serializers.ModelSerializer):
     category = TourCategorySerializer(read_only=True)
     tags = TourTagSerializer(read_only=True, many=True)
     images = TourImageSerializer(read_only=True, many=True)
     videos = TourVideoSerializer(read_only=True, many=True)
     itinerary = ItineraryDaySerializer(read_only=True, many=True)
-    route = TourStopSerializer(read_only=True, many=True)
+    route = TourStopSerializer(source="tour_stops", read_only=True, many=True)
     departures = TourDepartureSerializer(read_only=True, many=True)
 
     class Meta:
@@ -80,7 +150,7 @@ class TourDetailSerializer(serializers.ModelSerializer):
             "id", "slug", "title", "short_description", "long_description",
             "category", "tags", "days",
             "base_price", "currency", "discount_percent", "discount_amount", "price_after_discount",
-            "difficulty", "is_featured",
-            "images", "videos", "itinerary", "route", "departures",
+            "display_price", "display_currency", "difficulty", "is_featured",
+            "images", "videos", "itinerary", "route", "route_distance_km", "route_geometry", "departures",
             "meta_title", "meta_description", 'min_group', 'max_group',
         ]
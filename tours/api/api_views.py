@@ -1,45 +1,250 @@
 from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.cache import cache
 from django.db.models import Prefetch
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from tours.models import Tour, TourCategory, TourTag, TourImage, TourStop
+from core.conditional import ConditionalGetMixin, make_etag, normalized_query, respond_conditionally
+from core.i18n import lang
+from core.pagination import CatalogCursorPagination, SelectablePaginationMixin
+from core.serializers import is_sparse, param_list, sparse_fields
+from tours.models import Tour, TourCategory, TourTag, TourImage, TourStop, ItineraryDay
+from tours.cache import catalog_cache_key, catalog_version, list_cache_timeout
+from tours.calendar import MAX_MONTHS, departure_calendar, iter_months, month_end
+from tours.facets import tour_facets
+from tours.snapshots import get_snapshot, request_origin, store_snapshot
 from .api_serializers import (
     TourListSerializer, TourDetailSerializer, TourCategorySerializer, TourTagSerializer, TourDepartureSerializer
 )
-from .api_filters import TourFilter
-
-
-class TourViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = (
-        Tour.objects.filter(is_active=True, is_deleted=False)
-        .select_related("category")
-        .prefetch_related(
-            Prefetch("images", queryset=TourImage.objects.order_by("order", "id")),
-            Prefetch("tour_stops",  # <-- THROUGH yozuvlarni olamiz
-                     queryset=TourStop.objects.select_related("country", "city")
-                                               .order_by("order", "id")),
-            "tags",
-            "itinerary",   # <-- related_name ItineraryDay uchun
-            "videos",
-            "departures",
-        )
-        .distinct()
-    )
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+from .api_filters import TourFilter, TourSearchFilter, TourNearFilter, TourOrderingFilter, requested_currency
+
+
+class TourViewSet(SelectablePaginationMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Tour.objects.filter(is_active=True, is_deleted=False)
+    # ?paginate=cursor — keyset (order, -created_at, id); ?count=1 bo‘lsa jami soni ham
+    cursor_pagination_class = CatalogCursorPagination
+    filter_backends = [DjangoFilterBackend, TourSearchFilter, TourNearFilter, TourOrderingFilter]
     filterset_class = TourFilter
-    search_fields = ["^title", "short_description", "long_description", "tags__name", "category__name"]
-    ordering_fields = ["price_after_discount", "base_price", "days", "created_at", "order"]
+    # qidiruv tours.search indeksi orqali (TourSearchFilter); ro‘yxat — indeksga kiradigan maydonlar
+    search_fields = ["title", "short_description", "long_description", "tags__name", "category__name"]
+    ordering_fields = [
+        "price_after_discount", "effective_price", "base_price", "days", "route_distance_km", "created_at", "order",
+    ]
     ordering = ["order", "-created_at"]
     lookup_field = "slug"
+    # ?fields= / ?expand= (core.serializers): faqat javobga kiradigan bog‘lanishlar yuklanadi
+    select_related_fields = {
+        "category": "category", "cover": "cover", "cover_srcset": "cover",
+        "cover_width": "cover", "cover_height": "cover", "cover_placeholder": "cover",
+    }
+    # og‘ir matn ustunlari — so‘ralmasa DB dan o‘qilmaydi
+    deferrable_fields = ("short_description", "long_description", "meta_title", "meta_description", "route_geometry")
+
+    # batch: bitta so‘rovda ko‘pi bilan shuncha tur
+    max_batch_size = 50
+    # detail TourSnapshot jadvalidan o‘qiladi/yoziladi; eksport (tours.export) uni chetlab o‘tadi
+    use_snapshots = True
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ("list", "similar"):
+            return TourListSerializer
+        if self.action == "batch" and self.request.query_params.get("shape") != "detail":
             return TourListSerializer
         return TourDetailSerializer
 
+    def get_queryset(self):
+        # har bir action o‘z query rejasiga ega: `<action>_queryset(qs)`; bo‘lmasa — bazaviy queryset
+        queryset = super().get_queryset()
+        plan = getattr(self, f"{self.action}_queryset", None)
+        queryset = plan(queryset) if plan else queryset
+        # tarjima ustunlari: faqat aktiv til (+fallback) — defer'dan keyin, chiqarib tashlanganlarga tegmaydi
+        return queryset.for_language()
+
+    def prefetch_fields(self):
+        # Prefetch obyektlari har so‘rovda yangidan (ular holatga ega)
+        return {
+            "tags": "tags",
+            "images": Prefetch("images", queryset=TourImage.objects.order_by("order", "id")),
+            "videos": "videos",
+            "itinerary": Prefetch("itinerary", queryset=ItineraryDay.objects.for_language()),
+            "route": Prefetch("tour_stops",  # <-- THROUGH yozuvlarni olamiz
+                              queryset=TourStop.objects.select_related("country", "city__country")
+                                                        .order_by("order", "id")),
+            "departures": "departures",
+        }
+
+    def sparse_queryset(self, queryset):
+        fields = set(sparse_fields(self.request, self.get_serializer_class()))
+        related = [path for name, path in self.select_related_fields.items() if name in fields]
+        prefetch = [plan for name, plan in self.prefetch_fields().items() if name in fields]
+        deferred = [name for name in self.deferrable_fields if name not in fields]
+        if fields & {"next_departure", "seats_left"}:
+            queryset = queryset.with_departures()
+        if fields & {"display_price", "display_currency"}:
+            queryset = queryset.with_display_price(*requested_currency(self.request))
+        if related:
+            queryset = queryset.select_related(*related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+    def list_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
+
+    def retrieve_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
+
+    def batch_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
+
+    def similar_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
+
+    def conditional_etag_parts(self):
+        # next_departure / seats_left / departs_* — bugungi sanaga nisbatan
+        return (timezone.localdate(),)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(request, lambda: self._cached_list(request, *args, **kwargs))
+
+    def _cached_list(self, request, *args, **kwargs):
+        # filtr/qidiruv/saralash/sahifa + til bo‘yicha kesh; katalog versiyasi kalit ichida
+        key = catalog_cache_key("list", request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        cache.set(key, response.data, list_cache_timeout())
+        return response
+
+    @action(detail=False, methods=["get"], url_path="facets")
+    def facets(self, request, *args, **kwargs):
+        """
+        Filtr paneli uchun sonlar: list bilan bir xil TourFilter/search parametrlari.
+        Kategoriya, teg, davlat, difficulty, kun va narx oraliqlari + min/max narx (?currency= valyutasida).
+        """
+        key = catalog_cache_key("facets", request)
+        data = cache.get(key)
+        if data is None:
+            data = tour_facets(self.filter_queryset(self.get_queryset()), *requested_currency(request))
+            cache.set(key, data, list_cache_timeout())
+        return Response(data)
+
+    @action(detail=False, methods=["get"], url_path="batch")
+    def batch(self, request, *args, **kwargs):
+        """
+        Bir nechta tur bitta so‘rovda: ?slugs=a,b,c yoki ?ids=1,2,3; ?shape=detail — to‘liq shakl
+        (standart: list kartasi). ?fields=/?expand= ham ishlaydi. Tartib so‘rovdagidek,
+        topilmaganlar — `missing` da.
+        """
+        slugs = param_list(request, "slugs")
+        if slugs:
+            field, keys = "slug", slugs
+        else:
+            try:
+                field, keys = "pk", [int(v) for v in param_list(request, "ids")]
+            except ValueError:
+                raise ValidationError({"ids": "Butun sonlar ro‘yxati bo‘lishi kerak."})
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            raise ValidationError({"slugs": "slugs yoki ids parametri kerak."})
+        if len(keys) > self.max_batch_size:
+            raise ValidationError({field: f"Ko‘pi bilan {self.max_batch_size} ta."})
+
+        found = {getattr(tour, field): tour for tour in self.get_queryset().filter(**{f"{field}__in": keys})}
+        tours = [found[key] for key in keys if key in found]
+        return Response({
+            "results": self.get_serializer(tours, many=True).data,
+            "missing": [key for key in keys if key not in found],
+        })
+
+    @action(detail=False, methods=["get"], url_path="calendar")
+    def calendar(self, request, *args, **kwargs):
+        """
+        Jo‘nashlar kalendari: ?from=2026-11-01&to=2027-01-31&group=day|month.
+        TourFilter parametrlari (category, country, ...) ham ishlaydi. Oylik rollup keshdan olinadi.
+        """
+        today = timezone.localdate()
+        start = parse_date(request.query_params.get("from") or "") or today
+        # standart: joriy + keyingi 2 oy
+        end = parse_date(request.query_params.get("to") or "") or month_end(start, 2)
+        group = request.query_params.get("group", "day")
+        if group not in ("day", "month"):
+            raise ValidationError({"group": "day yoki month."})
+        if end < start or len(list(iter_months(start, end))) > MAX_MONTHS:
+            raise ValidationError({"to": f"from..to oralig‘i {MAX_MONTHS} oydan oshmasin."})
+
+        language = lang()
+        # from/to berilmasa oraliq bugungi sanadan hisoblanadi — hal qilingan sanalar ham validatorga kiradi
+        etag = make_etag("calendar", language, normalized_query(request), start, end, catalog_version())
+
+        def build():
+            tour_ids = None
+            if set(request.query_params) - {"from", "to", "group"}:
+                tour_ids = set(self.filter_queryset(self.get_queryset()).values_list("pk", flat=True))
+            return Response({
+                "from": start, "to": end, "group": group,
+                "results": departure_calendar(start, end, language, group, tour_ids),
+            })
+
+        return respond_conditionally(request, etag, None, build)
+
+    @action(detail=True, methods=["get"], url_path="similar")
+    def similar(self, request, *args, **kwargs):
+        """O‘xshash turlar (tours.similarity, TourSimilarity jadvali) — list kartasi shaklida, o‘xshashlik tartibida."""
+        slug = kwargs[self.lookup_field]
+        key = catalog_cache_key(f"similar:{slug}", request)
+        data = cache.get(key)
+        if data is None:
+            if not self.queryset.filter(slug=slug).exists():
+                raise Http404
+            tours = self.get_queryset().filter(similar_of__tour__slug=slug).order_by("similar_of__rank")
+            data = self.get_serializer(tours, many=True).data
+            cache.set(key, data, list_cache_timeout())
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        slug = kwargs[self.lookup_field]
+        # validator uchun faqat (pk, updated_at); bola yozuvlar o‘zgarsa signal tour.updated_at ni yangilaydi
+        row = self.queryset.filter(slug=slug).values_list("pk", "updated_at").first()
+        if row is None:
+            raise Http404
+        pk, updated_at = row
+        language = lang()
+        origin = request_origin(request)
+        etag = make_etag("tour", language, origin, pk, updated_at, normalized_query(request))
+        return respond_conditionally(
+            request, etag, updated_at, lambda: self._snapshot_response(slug, language, origin, updated_at)
+        )
+
+    def _snapshot_response(self, slug, language, origin, updated_at):
+        # (slug, til, origin) bo‘yicha tayyor snapshot; bo‘lmasa — serializatsiya qilib saqlab qo‘yamiz
+        # ?currency= — snapshot tur valyutasida saqlanadi, konvertatsiya qilingan javob alohida quriladi
+        converted = requested_currency(self.request)[0] is not None
+        cached = self.use_snapshots and not converted
+        data = get_snapshot(slug, language, origin, updated_at) if cached else None
+        sparse = is_sparse(self.request)
+        if data is not None:
+            if sparse:
+                # snapshot — to‘liq javob; ?fields= uchun undan kesib olinadi
+                data = {name: data[name] for name in sparse_fields(self.request, TourDetailSerializer) if name in data}
+            return Response(data)
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        if cached and not sparse:
+            store_snapshot(instance, language, origin, updated_at, data)
+        return Response(data)
+
 
-class TourCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class TourCategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = TourCategory.objects.filter(is_active=True)
     serializer_class = TourCategorySerializer
     filter_backends = [SearchFilter, OrderingFilter]
@@ -48,7 +253,7 @@ class TourCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ["order", "name"]
 
 
-class TourTagViewSet(viewsets.ReadOnlyModelViewSet):
+class TourTagViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = TourTag.objects.filter(is_active=True)
     serializer_class = TourTagSerializer
     filter_backends = [SearchFilter, OrderingFilter]
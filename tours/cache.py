@@ -0,0 +1,42 @@
+# tours/cache.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.conditional import normalized_query
+from core.i18n import lang
+
+CATALOG_VERSION_KEY = "tours:catalog-version"
+
+
+def catalog_version() -> int:
+    """
+    Katalog bo‘yicha umumiy versiya. Har qanday tur bilan bog‘liq o‘zgarishda
+    yangilanadi, shuning uchun eski kesh kalitlari o‘z-o‘zidan ishlatilmay qoladi.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(CATALOG_VERSION_KEY, version, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version() -> None:
+    # incr() o‘rniga vaqt: kalit kesh'dan tushib ketsa ham eski versiya qaytib kelmaydi
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def catalog_cache_key(prefix: str, request) -> str:
+    # host ham kiradi: javobdagi media URL'lar absolyut; sana — "kelgusi jo‘nash" hisoblari kun bilan o‘zgaradi
+    raw = "|".join([
+        request.get_host(), lang(), normalized_query(request), str(catalog_version()), str(timezone.localdate()),
+    ])
+    return f"tours:{prefix}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def list_cache_timeout() -> int:
+    return getattr(settings, "TOURS_LIST_CACHE_TIMEOUT", 600)
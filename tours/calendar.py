@@ -0,0 +1,83 @@
+# tours/calendar.py
+"""
+Jo‘nashlar kalendari: oy bo‘yicha tayyor "rollup" (kesh), so‘rov esa kerakli oylarni
+yig‘ib, sana oralig‘i va tur filtri bo‘yicha kesadi. Rollup kaliti katalog versiyasini o‘z ichiga oladi —
+jo‘nash/tur o‘zgarsa (signal, tours.inventory) o‘z-o‘zidan eskiradi.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import catalog_version, list_cache_timeout
+from .models import TourDeparture
+
+# bitta so‘rovda ko‘pi bilan shuncha oy
+MAX_MONTHS = 12
+
+
+def iter_months(start: date, end: date):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def month_end(day: date, months_ahead: int = 0) -> date:
+    """day oyidan months_ahead oy keyingi oyning oxirgi kuni."""
+    index = day.year * 12 + day.month - 1 + months_ahead + 1
+    return date(index // 12, index % 12 + 1, 1) - timedelta(days=1)
+
+
+def month_rollup(year: int, month: int, language: str) -> list[dict]:
+    """Oydagi barcha faol jo‘nashlar (start_date bo‘yicha), faol turlar uchun."""
+    key = f"tours:calendar:{language}:{year:04d}-{month:02d}:{catalog_version()}"
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+    first = date(year, month, 1)
+    following = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    departures = (
+        TourDeparture.objects.filter(
+            is_active=True, is_deleted=False,
+            start_date__gte=first, start_date__lt=following,  # (start_date, tour) indeksi
+            tour__is_active=True, tour__is_deleted=False,
+        )
+        .select_related("tour")
+        # title — aktiv til (fallback bilan) modeltranslation deskriptori orqali
+        .only("id", "start_date", "end_date", "seats_left", "tour__slug",
+              *(f"tour__title_{code}" for code in settings.MODELTRANSLATION_LANGUAGES))
+        .order_by("start_date", "tour_id", "id")
+    )
+    rows = [
+        {
+            "id": dep.pk,
+            "tour_id": dep.tour_id,
+            "tour": dep.tour.slug,
+            "title": dep.tour.title,
+            "start_date": dep.start_date.isoformat(),
+            "end_date": dep.end_date.isoformat(),
+            "seats_left": dep.seats_left,
+        }
+        for dep in departures
+    ]
+    cache.set(key, rows, list_cache_timeout())
+    return rows
+
+
+def departure_calendar(start: date, end: date, language: str, group: str = "day", tour_ids=None) -> list[dict]:
+    """
+    [{"key": "2026-11-03" | "2026-11", "count": n, "departures": [...]}] — start..end (ikkalasi ham kiradi).
+    tour_ids — TourFilter natijasi (None: filtrsiz).
+    """
+    first, last = start.isoformat(), end.isoformat()
+    groups = {}
+    for year, month in iter_months(start, end):
+        for row in month_rollup(year, month, language):
+            if not (first <= row["start_date"] <= last):
+                continue
+            if tour_ids is not None and row["tour_id"] not in tour_ids:
+                continue
+            key = row["start_date"] if group == "day" else row["start_date"][:7]
+            groups.setdefault(key, []).append({k: v for k, v in row.items() if k != "tour_id"})
+    return [{"key": key, "count": len(items), "departures": items} for key, items in groups.items()]
@@ -0,0 +1,193 @@
+# tours/export.py
+"""
+Ommaviy katalogning statik JSON eksporti (CDN uchun): har til uchun alohida papka.
+
+Javoblar haqiqiy API view'lari orqali (shu process ichida, RequestFactory bilan) olinadi —
+shakl, pagination havolalari va absolyut media URL'lar API'dagidek bir xil bo‘ladi.
+Throttle o‘chiriladi, til — APILanguageMiddleware kabi translation.activate. Umumiy TourSnapshot
+jadvali o‘qilmaydi va yozilmaydi (use_snapshots=False): detail har safar serializatsiya qilinadi.
+
+  <lang>/tours/list/page-<n>.json       GET /api/v1/tours/list/?page=n
+  <lang>/tours/<slug>.json              GET /api/v1/tours/list/<slug>/
+  <lang>/tours/categories/page-<n>.json GET /api/v1/tours/categories/?page=n
+  <lang>/tours/tags/page-<n>.json       GET /api/v1/tours/tags/?page=n
+  <lang>/locations/countries/page-<n>.json
+  <lang>/site/settings.json             GET /api/v1/site/settings/
+
+Fayllar vaqtinchalik nomdan os.replace bilan yoziladi; manifest.json — har fayl uchun sha256.
+Tarkibi o‘zgarmagan fayl qayta yozilmaydi. Inkremental rejimda tur detail'lari faqat oldingi
+eksportdan keyin o‘zgargan (updated_at) turlar uchun qayta olinadi; ro‘yxat sahifalari har safar
+olinadi (saralash/sana bog‘liq), lekin faqat hash o‘zgarsa yoziladi. Yo‘qolgan fayllar o‘chiriladi.
+"""
+import hashlib
+import json
+import os
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone, translation
+
+from .api.api_views import TourViewSet
+
+MANIFEST = "manifest.json"
+API_PREFIX = "/api/v1"
+
+# (fayl prefiksi, API yo‘li) — sahifalangan to‘plamlar
+COLLECTIONS = (
+    ("tours/list", "/tours/list/"),
+    ("tours/categories", "/tours/categories/"),
+    ("tours/tags", "/tours/tags/"),
+    ("locations/countries", "/locations/countries/"),
+)
+# (fayl, API yo‘li) — yagona obyektlar
+DOCUMENTS = (
+    ("site/settings.json", "/site/settings/"),
+)
+
+
+class ExportError(Exception):
+    pass
+
+
+def languages() -> list[str]:
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def config_key() -> str:
+    data = [settings.CATALOG_EXPORT_HOST, languages(), settings.REST_FRAMEWORK.get("PAGE_SIZE")]
+    return hashlib.sha1(json.dumps(data).encode()).hexdigest()[:16]
+
+
+class ApiRenderer:
+    """API yo‘lini shu process ichida chaqiradi va JSON baytlarini qaytaradi."""
+
+    def __init__(self, host: str):
+        self.factory = RequestFactory()
+        self.host = host
+        self._views = {}
+
+    def _view(self, func):
+        view = self._views.get(func)
+        if view is None:
+            initkwargs = {**getattr(func, "initkwargs", {}), "throttle_classes": ()}
+            if hasattr(func.cls, "use_snapshots"):
+                initkwargs["use_snapshots"] = False
+            actions = getattr(func, "actions", None)
+            view = func.cls.as_view(actions, **initkwargs) if actions else func.cls.as_view(**initkwargs)
+            self._views[func] = view
+        return view
+
+    def get(self, path: str, language: str, params=None) -> bytes:
+        path = API_PREFIX + path
+        match = resolve(path)
+        request = self.factory.get(
+            path, params or {}, secure=True, HTTP_HOST=self.host, HTTP_ACCEPT="application/json",
+        )
+        with translation.override(language):
+            request.LANGUAGE_CODE = language
+            response = self._view(match.func)(request, *match.args, **match.kwargs)
+            response.render()
+        if response.status_code != 200:
+            raise ExportError(f"{path} {params or ''} [{language}] -> {response.status_code}")
+        return response.content
+
+
+class CatalogExporter:
+    def __init__(self, root=None, full: bool = False):
+        self.root = root or settings.CATALOG_EXPORT_ROOT
+        self.renderer = ApiRenderer(settings.CATALOG_EXPORT_HOST)
+        previous = self._load_manifest()
+        if previous.get("config") != config_key():
+            previous = {}
+        self.previous_files = previous.get("files", {})
+        # --full: hamma detail qayta olinadi, lekin tarkibi o‘zgarmagan fayl baribir qayta yozilmaydi
+        self.since = None if full else previous.get("started_at")
+        self.files = {}
+        self.report = {"written": [], "removed": [], "unchanged": 0, "rendered": 0}
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.root, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, rel: str, content: bytes) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        path = os.path.join(self.root, rel)
+        self.files[rel] = digest
+        if self.previous_files.get(rel) == digest and os.path.exists(path):
+            self.report["unchanged"] += 1
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+        self.report["written"].append(rel)
+
+    def _keep(self, rel: str) -> bool:
+        # inkremental: o‘zgarmagan obyekt — oldingi fayl va hash saqlanadi
+        digest = self.previous_files.get(rel)
+        if digest and os.path.exists(os.path.join(self.root, rel)):
+            self.files[rel] = digest
+            self.report["unchanged"] += 1
+            return True
+        return False
+
+    def export_collection(self, prefix: str, path: str, language: str) -> None:
+        page = 1
+        while True:
+            content = self.renderer.get(path, language, {"page": page})
+            self.report["rendered"] += 1
+            self._write(f"{language}/{prefix}/page-{page}.json", content)
+            next_url = json.loads(content).get("next")
+            if not next_url:
+                return
+            page = int(parse_qs(urlsplit(next_url).query)["page"][0])
+
+    def export_tours(self, language: str) -> None:
+        tours = TourViewSet.queryset.order_by("pk")
+        changed = None
+        if self.since:
+            changed = set(tours.filter(updated_at__gte=self.since).values_list("slug", flat=True))
+        for slug in tours.values_list("slug", flat=True).iterator():
+            rel = f"{language}/tours/{slug}.json"
+            if changed is not None and slug not in changed and self._keep(rel):
+                continue
+            self.report["rendered"] += 1
+            self._write(rel, self.renderer.get(f"/tours/list/{slug}/", language))
+
+    def run(self) -> dict:
+        started_at = timezone.now()
+        os.makedirs(self.root, exist_ok=True)
+        for language in languages():
+            for prefix, path in COLLECTIONS:
+                self.export_collection(prefix, path, language)
+            for rel, path in DOCUMENTS:
+                self.report["rendered"] += 1
+                self._write(f"{language}/{rel}", self.renderer.get(path, language))
+            self.export_tours(language)
+
+        for rel in set(self.previous_files) - set(self.files):
+            path = os.path.join(self.root, rel)
+            if os.path.exists(path):
+                os.remove(path)
+            self.report["removed"].append(rel)
+
+        manifest = {
+            "config": config_key(),
+            "started_at": started_at.isoformat(),
+            "files": dict(sorted(self.files.items())),
+        }
+        tmp = os.path.join(self.root, f"{MANIFEST}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, os.path.join(self.root, MANIFEST))
+        return self.report
+
+
+def export_catalog(root=None, full: bool = False) -> dict:
+    return CatalogExporter(root=root, full=full).run()
@@ -0,0 +1,109 @@
+# tours/facets.py
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Max, Min, Q
+
+from locations.models import Country
+from .models import PRICE_QUANT, Tour, TourCategory, TourStop
+
+# (min, max) — max=None: yuqori chegara yo‘q. Kunlar — [min, max], narx — [min, max) BASE_CURRENCY da
+# (javobda chegaralar so‘ralgan valyutaga o‘tkaziladi — ?currency=UZS da ham turlar oraliqlarga taqsimlanadi)
+DAYS_BUCKETS = ((1, 3), (4, 7), (8, 14), (15, None))
+PRICE_BUCKETS = ((0, 300), (300, 700), (700, 1500), (1500, 3000), (3000, None))
+
+
+def _range_q(field, low, high, upper="lte"):
+    q = Q(**{f"{field}__gte": low})
+    if high is not None:
+        q &= Q(**{f"{field}__{upper}": high})
+    return q
+
+
+def _convert(value, rate):
+    return (value * rate).quantize(PRICE_QUANT) if value is not None else None
+
+
+def _edge(value, rate):
+    # butun chegara butun son bo‘lib qoladi (base valyutada 300, 300.00 emas)
+    value = _convert(value, rate)
+    return int(value) if value is not None and value == value.to_integral_value() else value
+
+
+def tour_facets(queryset, currency=None, rate=None) -> dict:
+    """
+    Filtrlangan turlar to‘plami bo‘yicha filtr paneli uchun sonlar.
+    Har bir o‘lcham — bitta GROUP BY (jami 6 ta so‘rov, katalog hajmiga bog‘liq emas).
+    Narx — effective_price_base bo‘yicha, PRICE_BUCKETS base valyutada; javobdagi min/max va
+    oraliq chegaralari so‘ralgan valyutaga (rate) o‘tkaziladi.
+    """
+    tours = Tour.objects.filter(pk__in=queryset.order_by().values("pk"))
+    currency, rate = currency or settings.BASE_CURRENCY, rate or Decimal("1")
+
+    # 1) kun/narx oraliqlari, difficulty va min/max — bitta aggregate
+    aggregates = {
+        "total": Count("pk"),
+        "price_min": Min("effective_price_base"),
+        "price_max": Max("effective_price_base"),
+    }
+    for i, (low, high) in enumerate(DAYS_BUCKETS):
+        aggregates[f"days_{i}"] = Count("pk", filter=_range_q("days", low, high))
+    for i, (low, high) in enumerate(PRICE_BUCKETS):
+        aggregates[f"price_{i}"] = Count("pk", filter=_range_q("effective_price_base", low, high, upper="lt"))
+    for value, _ in Tour.DIFFICULTY:
+        aggregates[f"difficulty_{value}"] = Count("pk", filter=Q(difficulty=value))
+    stats = tours.aggregate(**aggregates)
+
+    # 2) kategoriyalar (nomi aktiv tilda — modeltranslation)
+    category_counts = dict(
+        tours.order_by().values_list("category_id").annotate(count=Count("pk"))
+    )
+    categories = [
+        {"id": c.pk, "name": c.name, "slug": c.slug, "count": category_counts[c.pk]}
+        for c in TourCategory.objects.filter(pk__in=category_counts).order_by("order", "name")
+    ]
+
+    # 3) teglar — through jadval bo‘yicha
+    tags = [
+        {"id": row["tourtag_id"], "name": row["tourtag__name"], "slug": row["tourtag__slug"], "count": row["count"]}
+        for row in (
+            Tour.tags.through.objects.filter(tour_id__in=tours.values("pk"))
+            .values("tourtag_id", "tourtag__name", "tourtag__slug")
+            .annotate(count=Count("tour_id"))
+            .order_by("-count", "tourtag__name")
+        )
+    ]
+
+    # 4) marshrut davlatlari — bir turda davlat bir necha marta bo‘lishi mumkin
+    country_counts = dict(
+        TourStop.objects.filter(tour_id__in=tours.values("pk"), country__isnull=False)
+        .order_by().values_list("country_id").annotate(count=Count("tour_id", distinct=True))
+    )
+    countries = [
+        {"id": c.pk, "name": c.name, "iso2": c.iso2, "count": country_counts[c.pk]}
+        for c in Country.objects.filter(pk__in=country_counts).order_by("name")
+    ]
+
+    return {
+        "count": stats["total"],
+        "categories": categories,
+        "tags": tags,
+        "countries": countries,
+        "difficulty": [
+            {"value": value, "label": label, "count": stats[f"difficulty_{value}"]}
+            for value, label in Tour.DIFFICULTY
+        ],
+        "days": [
+            {"min": low, "max": high, "count": stats[f"days_{i}"]}
+            for i, (low, high) in enumerate(DAYS_BUCKETS)
+        ],
+        "price": {
+            "currency": currency,
+            "min": _convert(stats["price_min"], rate),
+            "max": _convert(stats["price_max"], rate),
+            "buckets": [
+                {"min": _edge(low, rate), "max": _edge(high, rate), "count": stats[f"price_{i}"]}
+                for i, (low, high) in enumerate(PRICE_BUCKETS)
+            ],
+        },
+    }
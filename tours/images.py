@@ -0,0 +1,40 @@
+# tours/images.py
+"""
+Tur rasmlarining thumb/card/hero nusxalari, o‘lchamlari va placeholder'i (core.images).
+Yuklangandan keyin signal orqali fon ishida, eskilari uchun: `python manage.py build_image_derivatives`.
+"""
+from core.images import build_derivatives, delete_derivatives
+
+from .models import ItineraryDay, TourImage
+
+# image + image_variants ustunlari bor modellar
+IMAGE_MODELS = (TourImage, ItineraryDay)
+
+
+def needs_variants(instance) -> bool:
+    variants = instance.image_variants or {}
+    if (instance.image.name or None) != variants.get("source"):
+        return True
+    # placeholder/o‘lchamlar keyinroq qo‘shilgan — eski yozuvlar ham qayta ishlanadi
+    return bool(instance.image) and "placeholder" not in variants
+
+
+def refresh_image_variants(model, pk, force: bool = False):
+    """
+    Bitta yozuv uchun nusxalarni (qayta) yaratadi. O‘zgarish bo‘lsa — tour_id, aks holda None.
+    Rasm almashtirilgan/olib tashlangan bo‘lsa eski nusxalar o‘chiriladi.
+    """
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None or not (force or needs_variants(instance)):
+        return None
+    storage = instance.image.storage
+    previous = instance.image_variants or {}
+    variants = build_derivatives(instance.image) if instance.image else {}
+    # shu orada rasm yana almashtirilgan bo‘lsa — yozmaymiz, keyingi ish o‘zi qiladi
+    updated = model._base_manager.filter(pk=pk, image=instance.image.name).update(image_variants=variants)
+    if not updated:
+        delete_derivatives(storage, variants)
+        return None
+    if previous.get("source") != variants.get("source"):
+        delete_derivatives(storage, previous)
+    return instance.tour_id
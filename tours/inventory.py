@@ -0,0 +1,57 @@
+# tours/inventory.py
+"""
+TourDeparture o‘rinlari (seats_left) bilan atomik ishlash.
+
+Har bir amal — bitta shartli UPDATE: "seats_left >= n bo‘lsa n ga kamaytir". Tekshirish va yozish
+DB ichida bitta operatsiya, shuning uchun parallel worker'lar o‘rinni ikki marta sota olmaydi
+(Postgres'da qator qulfi, SQLite'da yagona yozuvchi). seats_left = NULL — o‘rinlar hisoblanmaydi.
+"""
+from django.db.models import Case, F, PositiveSmallIntegerField, When
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from .models import TourDeparture
+from .signals import tours_changed
+
+
+class SeatsUnavailable(Exception):
+    pass
+
+
+def _changed(departure_id) -> None:
+    # departures detail javobida — snapshot va kesh eskiradi
+    tour_id = TourDeparture.objects.filter(pk=departure_id).values_list("tour_id", flat=True).first()
+    tours_changed([tour_id])
+
+
+def take_seats(departure_id, seats: int) -> int:
+    """
+    seats ta o‘rinni band qiladi. Qaytaradi: haqiqatda kamaytirilgan o‘rinlar soni
+    (o‘rinlar hisoblanmaydigan jo‘nashda 0). Yetmasa — SeatsUnavailable.
+    """
+    if seats <= 0:
+        return 0
+    updated = TourDeparture.objects.filter(pk=departure_id, seats_left__gte=seats).update(
+        seats_left=F("seats_left") - seats, updated_at=timezone.now()
+    )
+    if updated:
+        _changed(departure_id)
+        return seats
+    if TourDeparture.objects.filter(pk=departure_id, seats_left__isnull=True).exists():
+        return 0
+    raise SeatsUnavailable(departure_id)
+
+
+def return_seats(departure_id, seats: int) -> None:
+    """Band qilingan o‘rinlarni qaytaradi (seats_total dan oshirmaydi)."""
+    if seats <= 0:
+        return
+    TourDeparture.objects.filter(pk=departure_id, seats_left__isnull=False).update(
+        seats_left=Case(
+            When(seats_total__isnull=False, then=Least(F("seats_left") + seats, F("seats_total"))),
+            default=F("seats_left") + seats,
+            output_field=PositiveSmallIntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    _changed(departure_id)
@@ -0,0 +1,34 @@
+# tours/management/commands/build_image_derivatives.py
+from django.core.management.base import BaseCommand
+
+from tours.images import IMAGE_MODELS, needs_variants, refresh_image_variants
+from tours.signals import tours_changed
+
+
+class Command(BaseCommand):
+    help = "Build thumb/card/hero WebP+JPEG derivatives for TourImage and ItineraryDay images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rebuild even if derivatives are up to date.")
+
+    def handle(self, *args, **opts):
+        force = opts["force"]
+        tour_ids = set()
+        for model in IMAGE_MODELS:
+            built = failed = 0
+            rows = model._base_manager.exclude(image="").only("pk", "image", "image_variants", "tour_id")
+            for instance in rows.iterator(chunk_size=200):
+                if not (force or needs_variants(instance)):
+                    continue
+                try:
+                    tour_id = refresh_image_variants(model, instance.pk, force=force)
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} #{instance.pk}: {e}")
+                    continue
+                if tour_id:
+                    built += 1
+                    tour_ids.add(tour_id)
+            self.stdout.write(f"{model.__name__}: built={built} failed={failed}")
+        tours_changed(tour_ids)
+        self.stdout.write(self.style.SUCCESS(f"Done. tours={len(tour_ids)}"))
@@ -0,0 +1,12 @@
+# tours/management/commands/build_similar_tours.py
+from django.core.management.base import BaseCommand
+
+from tours.similarity import rebuild_similar, top_k
+
+
+class Command(BaseCommand):
+    help = "Recompute the top-K similar tours table (TourSimilarity) for the whole catalog."
+
+    def handle(self, *args, **opts):
+        rows = rebuild_similar()
+        self.stdout.write(self.style.SUCCESS(f"Done. k={top_k()} rows={rows}"))
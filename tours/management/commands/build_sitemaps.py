@@ -0,0 +1,22 @@
+# tours/management/commands/build_sitemaps.py
+from django.core.management.base import BaseCommand, CommandParser
+
+from tours.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Write per-language XML sitemaps (tours, categories) and the sitemap index; only changed chunks are rewritten."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--root", default=None, help="Output directory (default: settings.SITEMAP_ROOT).")
+        parser.add_argument("--force", action="store_true", help="Rewrite every chunk.")
+
+    def handle(self, *args, **opts):
+        report = build_sitemaps(root=opts["root"], force=opts["force"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. written={len(report['written'])} removed={len(report['removed'])} unchanged={report['unchanged']}"
+        ))
+        for name in report["written"]:
+            self.stdout.write(f"  + {name}")
+        for name in report["removed"]:
+            self.stdout.write(f"  - {name}")
@@ -0,0 +1,15 @@
+# tours/management/commands/build_tour_routes.py
+from django.core.management.base import BaseCommand
+
+from tours.routes import refresh_routes
+from tours.signals import tours_changed
+
+
+class Command(BaseCommand):
+    help = "Recompute stored route metrics (distance, bbox, centroid, coordinates, countries) for all tours."
+
+    def handle(self, *args, **opts):
+        updated = refresh_routes()
+        # updated_at ham yangilanadi — ETag/Last-Modified o‘zgaradi (build_image_derivatives kabi)
+        tours_changed(updated)
+        self.stdout.write(self.style.SUCCESS(f"Done. updated={len(updated)}"))
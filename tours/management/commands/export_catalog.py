@@ -0,0 +1,30 @@
+# tours/management/commands/export_catalog.py
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from tours.export import ExportError, export_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the public catalog (tour list pages, tour details, categories, tags, countries, site settings) "
+        "as static per-language JSON; only files whose content changed are rewritten."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--root", default=None, help="Output directory (default: settings.CATALOG_EXPORT_ROOT).")
+        parser.add_argument("--full", action="store_true", help="Re-render every tour detail, not only changed ones.")
+
+    def handle(self, *args, **opts):
+        try:
+            report = export_catalog(root=opts["root"], full=opts["full"])
+        except ExportError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. rendered={report['rendered']} written={len(report['written'])} "
+            f"removed={len(report['removed'])} unchanged={report['unchanged']}"
+        ))
+        # o‘zgargan yo‘llar — CDN purge uchun
+        for name in report["written"]:
+            self.stdout.write(f"  + {name}")
+        for name in report["removed"]:
+            self.stdout.write(f"  - {name}")
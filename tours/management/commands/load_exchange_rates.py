@@ -0,0 +1,86 @@
+# tours/management/commands/load_exchange_rates.py
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.utils import timezone
+
+from tours.models import ExchangeRate
+from tours.signals import exchange_rates_changed
+
+"""
+Fayl formatlari (kurs: 1 BASE_CURRENCY = rate birlik):
+  CSV:  currency,rate        (sarlavha ixtiyoriy)  ->  EUR,0.92 / UZS,12700
+  JSON: {"base": "USD", "rates": {"EUR": 0.92, "UZS": 12700}}
+"""
+
+
+def _read_rates(path: Path) -> dict:
+    if path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        base = (data.get("base") or settings.BASE_CURRENCY).upper()
+        if base != settings.BASE_CURRENCY:
+            raise CommandError(f"File base {base} != BASE_CURRENCY {settings.BASE_CURRENCY}.")
+        rows = data.get("rates", {}).items()
+    else:
+        with path.open(encoding="utf-8", newline="") as f:
+            rows = [row[:2] for row in csv.reader(f) if len(row) >= 2 and not row[0].startswith("#")]
+    rates = {}
+    for currency, rate in rows:
+        currency = str(currency).strip().upper()
+        if currency == "CURRENCY":  # sarlavha
+            continue
+        try:
+            value = Decimal(str(rate).strip())
+        except InvalidOperation:
+            raise CommandError(f"Invalid rate for {currency}: {rate!r}")
+        if len(currency) != 3 or value <= 0:
+            raise CommandError(f"Invalid row: {currency},{rate}")
+        rates[currency] = value
+    rates.pop(settings.BASE_CURRENCY, None)
+    return rates
+
+
+class Command(BaseCommand):
+    help = "Load exchange rates (1 BASE_CURRENCY = rate units) from a local CSV/JSON file and reprice tours."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--file", required=True, help="Path to rates .csv (currency,rate) or .json.")
+        parser.add_argument(
+            "--replace", action="store_true",
+            help="Delete currencies that are not in the file.",
+        )
+
+    def handle(self, *args, **opts):
+        path = Path(opts["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        rates = _read_rates(path)
+        if not rates:
+            raise CommandError("No rates in file.")
+
+        with transaction.atomic():
+            existing = {r.currency: r for r in ExchangeRate.objects.filter(currency__in=rates)}
+            to_create = [ExchangeRate(currency=c, rate=v) for c, v in rates.items() if c not in existing]
+            to_update = []
+            for currency, obj in existing.items():
+                if obj.rate != rates[currency]:
+                    obj.rate = rates[currency]
+                    obj.updated_at = timezone.now()
+                    to_update.append(obj)
+            ExchangeRate.objects.bulk_create(to_create)
+            ExchangeRate.objects.bulk_update(to_update, ["rate", "updated_at"])
+            deleted = 0
+            if opts["replace"]:
+                # queryset.delete() har qator uchun post_delete yuboradi — valyutalar shu yig‘imga qo‘shiladi
+                deleted, _ = ExchangeRate.objects.exclude(currency__in=rates).delete()
+            # bulk_create/bulk_update signal yubormaydi — o‘zgargan valyutalar qo‘lda; commit'dan keyin bitta qayta narxlash
+            exchange_rates_changed([obj.currency for obj in to_create + to_update])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. created={len(to_create)} updated={len(to_update)} deleted={deleted}"
+        ))
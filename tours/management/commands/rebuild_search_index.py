@@ -0,0 +1,14 @@
+# tours/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from tours.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the tour full-text search index (FTS5 on SQLite, TourSearchDocument elsewhere)."
+
+    def handle(self, *args, **opts):
+        backend = get_backend()
+        self.stdout.write(f"Backend: {type(backend).__name__}")
+        total = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Done. indexed={total}"))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:56
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Greatest, Round
+
+
+def fill_effective_price(apps, schema_editor):
+    # ifoda shu yerda (tours.models.effective_price_expression nusxasi) —
+    # keyingi model o‘zgarishlari migratsiyaga ta’sir qilmasin
+    Tour = apps.get_model("tours", "Tour")
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    Tour._base_manager.update(effective_price=Case(
+        When(base_price__isnull=True, then=Value(None, output_field=money)),
+        When(
+            Q(discount_percent__isnull=False) & ~Q(discount_percent=0),
+            # "/ 100" emas: SQLite'da butun son foiz butun bo‘linishga tushadi (10 / 100 = 0)
+            then=Round(ExpressionWrapper(
+                F("base_price") * (Value(Decimal("1")) - F("discount_percent") * Value(Decimal("0.01"))),
+                output_field=money,
+            ), 2, output_field=money),
+        ),
+        When(
+            Q(discount_amount__isnull=False) & ~Q(discount_amount=0),
+            then=Greatest(F("base_price") - F("discount_amount"), Value(Decimal("0")), output_field=money),
+        ),
+        default=F("base_price"),
+        output_field=money,
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0004_remove_tourtag_name_en_remove_tourtag_name_ru_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='effective_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=12, null=True),
+        ),
+        migrations.RunPython(fill_effective_price, migrations.RunPython.noop),
+    ]
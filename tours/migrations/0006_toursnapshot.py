@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:57
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0005_tour_effective_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TourSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField()),
+                ('language', models.CharField(max_length=8)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('tour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='tours.tour')),
+            ],
+            options={
+                'unique_together': {('slug', 'language')},
+            },
+        ),
+    ]
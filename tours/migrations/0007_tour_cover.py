@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_cover(apps, schema_editor):
+    Tour = apps.get_model("tours", "Tour")
+    TourImage = apps.get_model("tours", "TourImage")
+    first_image = (
+        TourImage.objects.filter(tour=OuterRef("pk"))
+        .order_by("-is_cover", "order", "id")
+        .values("pk")[:1]
+    )
+    Tour.objects.update(cover=Subquery(first_image))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0006_toursnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='cover',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tours.tourimage'),
+        ),
+        migrations.RunPython(fill_cover, migrations.RunPython.noop),
+    ]
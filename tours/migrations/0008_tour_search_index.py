@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = "tours_tour_fts"
+
+
+def create_fts_table(apps, schema_editor):
+    # faqat SQLite: boshqa DB'larda tours.search.DatabaseSearchBackend ishlaydi
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "language UNINDEXED, title, body, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0007_tour_cover'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TourSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=8)),
+                ('title', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('tour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='tours.tour')),
+            ],
+            options={
+                'unique_together': {('tour', 'language')},
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('tours', '0008_tour_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['order', '-created_at', 'id'], name='tour_catalog_order_idx'),
+        ),
+    ]
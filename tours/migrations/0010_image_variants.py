@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0009_tour_catalog_order_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='itineraryday',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tourimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tourdeparture',
+            index=models.Index(fields=['start_date', 'tour'], name='departure_start_tour_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0011_departure_start_tour_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tourdeparture',
+            index=models.Index(fields=['tour', 'start_date'], name='departure_tour_start_idx'),
+        ),
+    ]
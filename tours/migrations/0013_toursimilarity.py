@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0012_departure_tour_start_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TourSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_of', to='tours.tour')),
+                ('tour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_links', to='tours.tour')),
+            ],
+            options={
+                'ordering': ['tour', 'rank'],
+                'indexes': [models.Index(fields=['tour', 'rank'], name='tour_similarity_rank_idx')],
+                'unique_together': {('tour', 'similar')},
+            },
+        ),
+    ]
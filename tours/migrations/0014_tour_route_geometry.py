@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0013_toursimilarity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='route_distance_km',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=1, editable=False, max_digits=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='route_geometry',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:22
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, ExpressionWrapper, F, OuterRef, Subquery, When
+from django.db.models.functions import Round
+
+
+def fill_base_price(apps, schema_editor):
+    # kurslar hali yo‘q: faqat BASE_CURRENCY dagi turlar to‘ladi, qolganlari load_exchange_rates dan keyin.
+    # ifoda shu yerda (tours.models.base_price_expression nusxasi, tarixiy modellar bilan) —
+    # keyingi model o‘zgarishlari migratsiyaga ta’sir qilmasin
+    Tour = apps.get_model("tours", "Tour")
+    ExchangeRate = apps.get_model("tours", "ExchangeRate")
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    rate = Subquery(ExchangeRate.objects.filter(currency=OuterRef("currency")).values("rate")[:1])
+    Tour._base_manager.update(effective_price_base=Case(
+        When(currency=settings.BASE_CURRENCY, then=F("effective_price")),
+        default=Round(ExpressionWrapper(F("effective_price") / rate, output_field=money), 2, output_field=money),
+        output_field=money,
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0014_tour_route_geometry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=6, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='effective_price_base',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=12, null=True),
+        ),
+        migrations.RunPython(fill_base_price, migrations.RunPython.noop),
+    ]
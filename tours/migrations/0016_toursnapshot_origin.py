@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:36
+
+from django.db import migrations, models
+
+
+def drop_snapshots(apps, schema_editor):
+    # eski nusxalarda origin/source_updated_at yo‘q — keyingi so‘rovda qayta quriladi
+    apps.get_model("tours", "TourSnapshot").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0015_exchange_rates'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_snapshots, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='toursnapshot',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='toursnapshot',
+            name='origin',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='toursnapshot',
+            name='source_updated_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='toursnapshot',
+            unique_together={('slug', 'language', 'origin')},
+        ),
+    ]
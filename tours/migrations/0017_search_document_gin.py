@@ -0,0 +1,34 @@
+from django.db import migrations
+
+INDEX = "tour_search_doc_fts_idx"
+# tours.search.PostgresSearchBackend.document() bilan aynan bir xil ifoda — so‘rov shu indeksdan o‘qiydi
+DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, COALESCE(body, '')), 'B')"
+)
+
+
+def create_gin_index(apps, schema_editor):
+    # faqat PostgreSQL: SQLite'da FTS5 jadvali (0008) ishlatiladi
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX} ON tours_toursearchdocument USING gin (({DOCUMENT}))"
+    )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0016_toursnapshot_origin'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
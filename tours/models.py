@@ -1,8 +1,18 @@
-from django.db import models
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, When, Value, F, Func, Q, ExpressionWrapper, OuterRef, Subquery, Sum
+from django.db.models.functions import Greatest, Round
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.text import slugify
 
 from common.models import BaseModel
+from core.i18n import LanguageScopedQuerySet
 from locations.models import Country, City
 
 
@@ -29,6 +39,159 @@ class TourTag(BaseModel):
         return self.name
 
 
+# queryset.update() post_save yubormaydi; kuzatuvchilar uchun: sender=Tour, pks=[...], fields={...}
+tours_bulk_updated = Signal()
+
+PRICE_FIELDS = frozenset({"base_price", "discount_percent", "discount_amount", "currency"})
+PRICE_QUANT = Decimal("0.01")
+EXCHANGE_RATES_CACHE_KEY = "tours:exchange_rates"
+
+
+class ExchangeRateQuerySet(models.QuerySet):
+    def rates(self) -> dict:
+        """{valyuta: 1 BASE_CURRENCY necha birlik} — keshda; kurslar o‘zgarganda kalit o‘chiriladi."""
+        rates = cache.get(EXCHANGE_RATES_CACHE_KEY)
+        if rates is None:
+            rates = dict(self.values_list("currency", "rate"))
+            rates[settings.BASE_CURRENCY] = Decimal("1")
+            cache.set(EXCHANGE_RATES_CACHE_KEY, rates, None)
+        return rates
+
+
+class ExchangeRate(models.Model):
+    """
+    Valyuta kursi: 1 BASE_CURRENCY = rate birlik (masalan BASE=USD: EUR 0.92, UZS 12700).
+    Fayldan yuklanadi: `python manage.py load_exchange_rates --file rates.csv`.
+    """
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=6)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ExchangeRateQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["currency"]
+
+    def __str__(self):
+        return f"1 {settings.BASE_CURRENCY} = {self.rate} {self.currency}"
+
+
+class Divide(Func):
+    """
+    a / b. SQLite NUMERIC ustunlarda butun qiymatlarni butun son sifatida saqlaydi va butun bo‘linish
+    qiladi (350 / 12500 = 0) — u yerda surat REAL ga o‘tkaziladi. Boshqa DB'larda oddiy numeric bo‘linish.
+    """
+    arg_joiner = " / "
+    template = "(%(expressions)s)"
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template="(CAST(%(expressions)s)", arg_joiner=" AS REAL) / ", **extra_context)
+
+
+def base_price_expression(price=None):
+    """
+    effective_price (tur valyutasida) -> BASE_CURRENCY, SQL ichida (kurs subquery orqali).
+    Kursi yo‘q valyutada NULL — narx filtrlari/saralashiga kirmaydi.
+    """
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    price = price if price is not None else F("effective_price")
+    rate = Subquery(ExchangeRate.objects.filter(currency=OuterRef("currency")).values("rate")[:1])
+    return Case(
+        When(currency=settings.BASE_CURRENCY, then=price),
+        default=Round(Divide(price, rate, output_field=money), 2, output_field=money),
+        output_field=money,
+    )
+
+
+def effective_price_expression():
+    """
+    `Tour.price_after_discount` property'sining SQL ekvivalenti.
+    Bulk `update()` dan keyin `effective_price` ni DB ichida qayta hisoblash uchun.
+    """
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    return Case(
+        When(base_price__isnull=True, then=Value(None, output_field=money)),
+        When(
+            Q(discount_percent__isnull=False) & ~Q(discount_percent=0),
+            # "/ 100" emas: SQLite'da butun son foiz butun bo‘linishga tushadi (10 / 100 = 0)
+            then=Round(ExpressionWrapper(
+                F("base_price") * (Value(Decimal("1")) - F("discount_percent") * Value(Decimal("0.01"))),
+                output_field=money,
+            ), 2, output_field=money),
+        ),
+        When(
+            Q(discount_amount__isnull=False) & ~Q(discount_amount=0),
+            then=Greatest(F("base_price") - F("discount_amount"), Value(Decimal("0")), output_field=money),
+        ),
+        default=F("base_price"),
+        output_field=money,
+    )
+
+
+class TourQuerySet(LanguageScopedQuerySet):
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            if not pks:
+                return rows
+            # narx maydonlari o‘zgarsa — effective_price ham shu tranzaksiyada yangilanadi
+            if PRICE_FIELDS & kwargs.keys() and not {"effective_price", "effective_price_base"} & kwargs.keys():
+                self.model.objects.using(self.db).filter(pk__in=pks).refresh_effective_price()
+        tours_bulk_updated.send(sender=self.model, pks=pks, fields=set(kwargs))
+        return rows
+
+    def refresh_effective_price(self):
+        # SET ichida ustunlar eski qiymatni ko‘radi — base narx ham ifodadan hisoblanadi
+        price = effective_price_expression()
+        return super().update(effective_price=price, effective_price_base=base_price_expression(price))
+
+    def refresh_base_price(self):
+        """Kurslar o‘zgargandan keyin (load_exchange_rates / admin): bitta UPDATE + tours_bulk_updated."""
+        return self.update(effective_price_base=base_price_expression())
+
+    def with_display_price(self, currency=None, rate=None):
+        """
+        display_price / display_currency — SQL annotatsiya (serializer'da Decimal hisob yo‘q).
+        currency berilmasa — turning o‘z valyutasidagi narx; berilsa — effective_price_base * rate.
+        """
+        if currency is None:
+            return self.annotate(display_price=F("effective_price"), display_currency=F("currency"))
+        money = models.DecimalField(max_digits=14, decimal_places=2)
+        return self.annotate(
+            display_price=Round(
+                ExpressionWrapper(F("effective_price_base") * Value(rate), output_field=money), 2,
+                output_field=money,
+            ),
+            display_currency=Value(currency, output_field=models.CharField()),
+        )
+
+    def refresh_cover(self):
+        """cover = is_cover belgilangan rasm, bo‘lmasa tartib bo‘yicha birinchi rasm (bitta UPDATE)."""
+        first_image = (
+            TourImage.objects.filter(tour=OuterRef("pk"))
+            .order_by("-is_cover", "order", "id")
+            .values("pk")[:1]
+        )
+        return super().update(cover=Subquery(first_image))
+
+    def with_departures(self, today=None):
+        """
+        next_departure — eng yaqin kelgusi jo‘nash sanasi, seats_left — kelgusi jo‘nashlardagi
+        bo‘sh o‘rinlar yig‘indisi. Ikkalasi ham korrelyatsiyalangan subquery: departures prefetch qilinmaydi.
+        """
+        upcoming = TourDeparture.objects.filter(
+            tour=OuterRef("pk"), is_active=True, is_deleted=False,
+            start_date__gte=today or timezone.localdate(),
+        )
+        return self.annotate(
+            next_departure=Subquery(upcoming.order_by("start_date").values("start_date")[:1]),
+            seats_left=Subquery(
+                upcoming.order_by().values("tour").annotate(total=Sum("seats_left")).values("total")
+            ),
+        )
+
+
 class Tour(BaseModel):
     STATUS = (
         ("draft", "Draft"),
@@ -63,6 +226,14 @@ class Tour(BaseModel):
         max_digits=12, decimal_places=2, null=True, blank=True,
         help_text="Valyutadagi chegirma (masalan 50.00 USD)"
     )
+    # price_after_discount ning saqlangan nusxasi: filter/ordering DB indeksida ishlaydi
+    effective_price = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True, editable=False, db_index=True
+    )
+    # effective_price BASE_CURRENCY da (ExchangeRate): narx filtrlari va saralash shu indeks bo‘yicha
+    effective_price_base = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True, editable=False, db_index=True
+    )
 
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY, default="easy")
     is_featured = models.BooleanField(default=False)
@@ -73,11 +244,29 @@ class Tour(BaseModel):
     meta_description = models.CharField(max_length=255, blank=True)
     order = models.PositiveIntegerField(default=0)
 
+    # Ro‘yxat kartasi va admin uchun tayyor cover (TourImage signallari orqali yangilanadi)
+    cover = models.ForeignKey(
+        "TourImage", on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+"
+    )
+
     # M2M via through (marshrut uchun)
     stops = models.ManyToManyField(City, through="TourStop", related_name="tours", blank=True)
 
+    # Marshrut xulosasi (tours.routes): TourStop/City/Country o‘zgarsa signal orqali qayta hisoblanadi
+    route_distance_km = models.DecimalField(
+        max_digits=8, decimal_places=1, null=True, blank=True, editable=False, db_index=True
+    )
+    # {"coordinates": [[lat, lng], ...], "bbox": {...}, "centroid": {...}, "countries": [...]}
+    route_geometry = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = TourQuerySet.as_manager()
+
     class Meta:
         ordering = ["order", '-created_at']
+        indexes = [
+            # katalog tartibi va keyset pagination (core.pagination.CatalogCursorPagination)
+            models.Index(fields=["order", "-created_at", "id"], name="tour_catalog_order_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -94,6 +283,16 @@ class Tour(BaseModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)[:50]
+        price = self.price_after_discount
+        # ROUND_HALF_UP: SQL ROUND (effective_price_expression / base_price_expression) bilan bir xil natija
+        self.effective_price = Decimal(price).quantize(PRICE_QUANT, ROUND_HALF_UP) if price is not None else None
+        rate = ExchangeRate.objects.rates().get(self.currency)
+        self.effective_price_base = (
+            (self.effective_price / rate).quantize(PRICE_QUANT, ROUND_HALF_UP) if self.effective_price is not None and rate else None
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and PRICE_FIELDS & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "effective_price", "effective_price_base"}
         super().save(*args, **kwargs)
 
     @property
@@ -151,6 +350,10 @@ class ItineraryDay(BaseModel):
     title = models.CharField(max_length=200, blank=True)
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to="tours/itinerary/", blank=True)
+    # thumb/card/hero nusxalari (core.images) — fon ishida to‘ldiriladi
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = LanguageScopedQuerySet.as_manager()
 
     class Meta:
         ordering = ["day_number"]
@@ -163,6 +366,8 @@ class ItineraryDay(BaseModel):
 class TourImage(BaseModel):
     tour = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="tours/images/")
+    # thumb/card/hero nusxalari (core.images) — fon ishida to‘ldiriladi
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     alt = models.CharField(max_length=200, blank=True)
     is_cover = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
@@ -203,6 +408,72 @@ class TourDeparture(BaseModel):
 
     class Meta:
         ordering = ["start_date"]
+        indexes = [
+            # kalendar (tours.calendar) — sana oralig‘i bo‘yicha
+            models.Index(fields=["start_date", "tour"], name="departure_start_tour_idx"),
+            # tur bo‘yicha: next_departure/seats_left subquery'lari va departs_* EXISTS filtrlari
+            models.Index(fields=["tour", "start_date"], name="departure_tour_start_idx"),
+        ]
 
     def __str__(self):
         return f"{self.tour.title} [{self.start_date} → {self.end_date}]"
+
+
+class TourSnapshot(models.Model):
+    """
+    TourDetailSerializer natijasining (tur, til, origin) bo‘yicha tayyor JSON nusxasi.
+    Detail so‘rovi bitta indeks qidiruviga tushadi; tur yoki uning
+    bog‘liq yozuvlari o‘zgarganda signal orqali o‘chiriladi.
+    - origin: "https://host" — payload'dagi media URL'lar absolyut, so‘rov host'idan quriladi
+    - source_updated_at: payload qaysi tour.updated_at holatidan qurilgani; mos kelmasa nusxa ishlatilmaydi
+    """
+    tour = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name="snapshots")
+    slug = models.SlugField()
+    language = models.CharField(max_length=8)
+    origin = models.CharField(max_length=255, default="")
+    source_updated_at = models.DateTimeField(null=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (("slug", "language", "origin"),)
+
+    def __str__(self):
+        return f"{self.slug} [{self.language}]"
+
+
+class TourSearchDocument(models.Model):
+    """
+    Qidiruv indeksi uchun (tur, til) matni — FTS5 bo‘lmagan DB'lar uchun
+    (tours.search.PostgresSearchBackend — GIN indeks bilan, DatabaseSearchBackend).
+    SQLite'da tours_tour_fts ishlatiladi.
+    """
+    tour = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name="search_documents")
+    language = models.CharField(max_length=8)
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = (("tour", "language"),)
+
+    def __str__(self):
+        return f"{self.tour_id} [{self.language}]"
+
+
+class TourSimilarity(models.Model):
+    """
+    Har bir tur uchun eng o‘xshash K ta tur (tours.similarity) — tayyor jadval.
+    "O‘xshash turlar" bloki (tour, rank) indeksi bo‘yicha bitta o‘qish.
+    """
+    tour = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name="similar_links")
+    similar = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name="similar_of")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["tour", "rank"]
+        unique_together = (("tour", "similar"),)
+        indexes = [models.Index(fields=["tour", "rank"], name="tour_similarity_rank_idx")]
+
+    def __str__(self):
+        return f"{self.tour_id} → {self.similar_id} ({self.score:.2f})"
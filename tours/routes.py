@@ -0,0 +1,78 @@
+# tours/routes.py
+"""
+Marshrut xulosasi: TourStop tartibida nuqtalar (city koordinatasi, bo‘lmasa country'niki),
+umumiy masofa (katta doira, core.geo), bbox, markaz va davlatlar ro‘yxati.
+Natija Tour.route_distance_km / Tour.route_geometry ga yoziladi — ro‘yxat va xarita
+TourStop -> City -> Country JOIN'larisiz ishlaydi.
+  to‘liq: `python manage.py build_tour_routes`, qisman: refresh_routes(tour_ids) — signal orqali.
+"""
+from decimal import Decimal
+
+from core.geo import bounding_box, centroid, path_length_km
+
+from .models import Tour, TourStop
+
+COORD_DIGITS = 6
+
+
+def _point(city_lat, city_lng, country_lat, country_lng):
+    if city_lat is not None and city_lng is not None:
+        return float(city_lat), float(city_lng)
+    if country_lat is not None and country_lng is not None:
+        return float(country_lat), float(country_lng)
+    return None
+
+
+def route_summary(stops) -> tuple:
+    """
+    stops — tartiblangan (city_lat, city_lng, country_lat, country_lng, country_id, iso2, name) qatorlari.
+    Qaytaradi: (route_distance_km, route_geometry).
+    """
+    points, countries = [], {}
+    for city_lat, city_lng, country_lat, country_lng, country_id, iso2, name in stops:
+        point = _point(city_lat, city_lng, country_lat, country_lng)
+        if point:
+            points.append(point)
+        if country_id and country_id not in countries:
+            countries[country_id] = {"id": country_id, "iso2": iso2, "name": name}
+    if not points:
+        return None, {"countries": list(countries.values())} if countries else {}
+    distance = Decimal(str(round(path_length_km(points), 1)))
+    return distance, {
+        "coordinates": [[round(lat, COORD_DIGITS), round(lng, COORD_DIGITS)] for lat, lng in points],
+        "bbox": {key: round(value, COORD_DIGITS) for key, value in bounding_box(points).items()},
+        "centroid": {key: round(value, COORD_DIGITS) for key, value in centroid(points).items()},
+        "countries": list(countries.values()),
+    }
+
+
+def refresh_routes(tour_ids=None) -> list[int]:
+    """
+    Berilgan (None — barcha) turlar uchun xulosani qayta hisoblaydi: bitta so‘rov bilan bekatlar,
+    so‘ng faqat o‘zgargan turlarga UPDATE. Qaytaradi: yangilangan turlar id'lari.
+    """
+    tours = Tour._base_manager.all()
+    stops = TourStop.objects.all()
+    if tour_ids is not None:
+        tour_ids = {pk for pk in tour_ids if pk}
+        if not tour_ids:
+            return []
+        tours = tours.filter(pk__in=tour_ids)
+        stops = stops.filter(tour_id__in=tour_ids)
+
+    grouped = {}
+    for tour_id, *row in stops.order_by("tour_id", "order", "id").values_list(
+        "tour_id", "city__lat", "city__lng", "country__lat", "country__lng",
+        "country_id", "country__iso2", "country__name",
+    ):
+        grouped.setdefault(tour_id, []).append(row)
+
+    updated = []
+    for pk, distance, geometry in tours.values_list("pk", "route_distance_km", "route_geometry"):
+        new_distance, new_geometry = route_summary(grouped.get(pk, ()))
+        if (new_distance, new_geometry) == (distance, geometry):
+            continue
+        # _base_manager: TourQuerySet.update() dagi bulk signal chaqirilmaydi (o‘xshashlik o‘zgarmaydi)
+        Tour._base_manager.filter(pk=pk).update(route_distance_km=new_distance, route_geometry=new_geometry)
+        updated.append(pk)
+    return updated
@@ -0,0 +1,251 @@
+# tours/search.py
+"""
+Tur katalogi uchun to‘liq matnli qidiruv.
+
+Backend settings.TOURS_SEARCH_BACKEND (dotted path) orqali almashtiriladi.
+Ko‘rsatilmasa: SQLite'da FTS5 virtual jadvali, PostgreSQL'da TourSearchDocument ustida
+tsvector + GIN indeks (ts_rank bilan), boshqa DB'larda — vaqtinchalik oddiy qidiruv
+(relevantlik yo‘q). Indeks tur o‘zgarganda signal orqali qisman yangilanadi,
+to‘liq qayta qurish: `python manage.py rebuild_search_index`.
+"""
+import logging
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from .models import Tour, TourSearchDocument
+
+log = logging.getLogger(__name__)
+
+LANGUAGES = tuple(settings.MODELTRANSLATION_LANGUAGES)
+MAX_RESULTS = 1000
+
+# indeks hujjatiga (tour_documents / indexable_tours) ta’sir qiladigan Tour maydonlari;
+# boshqa maydonlar (narx, o‘rinlar, rasm va h.k.) o‘zgarsa qayta indekslanmaydi
+INDEXED_FIELDS = frozenset(
+    {"category", "category_id", "is_active", "is_deleted"}
+    | {
+        f"{name}{suffix}"
+        for name in ("title", "short_description", "long_description")
+        for suffix in ("", *(f"_{language}" for language in LANGUAGES))
+    }
+)
+
+
+def tour_documents(tour) -> list[tuple[str, str, str]]:
+    """(til, sarlavha, matn) — har bir til uchun indekslanadigan hujjat (HTML tozalangan)."""
+    tags = " ".join(t.name for t in tour.tags.all())
+    docs = []
+    for language in LANGUAGES:
+        body = " ".join(filter(None, [
+            strip_tags(getattr(tour, f"short_description_{language}") or ""),
+            strip_tags(getattr(tour, f"long_description_{language}") or ""),
+            tags,
+            getattr(tour.category, f"name_{language}") or "",
+        ]))
+        docs.append((language, getattr(tour, f"title_{language}") or "", body))
+    return docs
+
+
+def indexable_tours():
+    return (
+        Tour.objects.filter(is_active=True, is_deleted=False)
+        .select_related("category")
+        .prefetch_related("tags")
+    )
+
+
+class BaseSearchBackend:
+    def search(self, terms: list[str]) -> list[int]:
+        """Relevantlik bo‘yicha tartiblangan tur id'lari (eng mosi birinchi)."""
+        raise NotImplementedError
+
+    def add(self, tours) -> None:
+        raise NotImplementedError
+
+    def remove(self, tour_ids) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def index_tours(self, tour_ids) -> None:
+        """Berilgan turlarni qayta indekslaydi; ko‘rinmaydigan/o‘chirilganlari indeksdan chiqadi."""
+        tour_ids = set(tour_ids)
+        if not tour_ids:
+            return
+        tours = list(indexable_tours().filter(pk__in=tour_ids))
+        with transaction.atomic():
+            self.remove(tour_ids)
+            self.add(tours)
+
+    def rebuild(self, chunk_size: int = 500) -> int:
+        total = 0
+        with transaction.atomic():
+            self.clear()
+            batch = []
+            for tour in indexable_tours().order_by("pk").iterator(chunk_size=chunk_size):
+                batch.append(tour)
+                if len(batch) >= chunk_size:
+                    self.add(batch)
+                    total += len(batch)
+                    batch = []
+            self.add(batch)
+            total += len(batch)
+        return total
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    FTS5 virtual jadvali (0008 migratsiyasida yaratiladi). rowid = tour_id * 8 + til indeksi —
+    o‘chirish rowid bo‘yicha, to‘liq skan qilinmaydi.
+    """
+    table = "tours_tour_fts"
+    slots = 8
+    title_weight = 10.0
+
+    def _rowid(self, tour_id, language):
+        return tour_id * self.slots + LANGUAGES.index(language)
+
+    @staticmethod
+    def _match_query(terms):
+        # har bir termin — prefiks bo‘yicha ibora: "samar"* ; FTS sintaksisi belgilari zararsizlantiriladi
+        return " ".join('"%s"*' % t.replace('"', " ").strip() for t in terms if t.replace('"', "").strip())
+
+    def search(self, terms):
+        match = self._match_query(terms)
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, 0, %s, 1.0) LIMIT %s",
+                [match, self.title_weight, MAX_RESULTS * len(LANGUAGES)],
+            )
+            rowids = [row[0] for row in cursor.fetchall()]
+        # bir tur bir necha tilda topilishi mumkin — eng yaxshi o‘rni qoladi
+        return list(dict.fromkeys(rowid // self.slots for rowid in rowids))[:MAX_RESULTS]
+
+    def add(self, tours):
+        rows = [
+            (self._rowid(tour.pk, language), language, title, body)
+            for tour in tours
+            for language, title, body in tour_documents(tour)
+        ]
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {self.table} (rowid, language, title, body) VALUES (%s, %s, %s, %s)", rows
+                )
+
+    def remove(self, tour_ids):
+        rowids = [tour_id * self.slots + i for tour_id in tour_ids for i in range(len(LANGUAGES))]
+        if rowids:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN ({', '.join(['%s'] * len(rowids))})", rowids
+                )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Vaqtinchalik zaxira (FTS'i yo‘q DB'lar uchun): TourSearchDocument ustida icontains —
+    JOIN'siz, lekin indekssiz skan va haqiqiy relevantlik yo‘q (faqat "sarlavhada bormi", so‘ng id).
+    PostgreSQL'da PostgresSearchBackend ishlatiladi.
+    """
+
+    def search(self, terms):
+        terms = [t for t in terms if t]
+        if not terms:
+            return []
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(body__icontains=term)
+        rows = (
+            TourSearchDocument.objects.filter(condition)
+            .annotate(title_hit=Case(When(title__icontains=terms[0], then=Value(0)),
+                                     default=Value(1), output_field=IntegerField()))
+            .order_by("title_hit", "tour_id")
+            .values_list("tour_id", flat=True)[:MAX_RESULTS * len(LANGUAGES)]
+        )
+        return list(dict.fromkeys(rows))[:MAX_RESULTS]
+
+    def add(self, tours):
+        TourSearchDocument.objects.bulk_create([
+            TourSearchDocument(tour=tour, language=language, title=title, body=body)
+            for tour in tours
+            for language, title, body in tour_documents(tour)
+        ])
+
+    def remove(self, tour_ids):
+        TourSearchDocument.objects.filter(tour_id__in=tour_ids).delete()
+
+    def clear(self):
+        TourSearchDocument.objects.all().delete()
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    """
+    PostgreSQL: TourSearchDocument ustida tsvector (sarlavha — A, matn — B og‘irligi), ts_rank bo‘yicha
+    tartib. document() ifodasi 0017 migratsiyasidagi GIN indeks ifodasi bilan bir xil bo‘lishi shart —
+    aks holda so‘rov indeksdan foydalanmaydi. "simple" konfiguratsiya: o‘zbek tili uchun stemmer yo‘q,
+    uch til bitta indeksda. Yozish (add/remove/clear) DatabaseSearchBackend'dan.
+    """
+    config = "simple"
+
+    def document(self):
+        return (
+            SearchVector("title", weight="A", config=self.config)
+            + SearchVector("body", weight="B", config=self.config)
+        )
+
+    def query(self, terms):
+        # har so‘z prefiks bo‘yicha: samar:* & tog:* ; tsquery sintaksisi belgilari tashlab yuboriladi
+        words = re.findall(r"\w+", " ".join(terms))
+        if not words:
+            return None
+        return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config=self.config)
+
+    def search(self, terms):
+        query = self.query(terms)
+        if query is None:
+            return []
+        rows = (
+            TourSearchDocument.objects.annotate(document=self.document())
+            .filter(document=query)
+            .annotate(rank=SearchRank(F("document"), query))
+            .order_by("-rank", "tour_id")
+            .values_list("tour_id", flat=True)[:MAX_RESULTS * len(LANGUAGES)]
+        )
+        # bir tur bir necha tilda topilishi mumkin — eng yaxshi o‘rni qoladi
+        return list(dict.fromkeys(rows))[:MAX_RESULTS]
+
+
+@lru_cache(maxsize=1)
+def get_backend() -> BaseSearchBackend:
+    path = getattr(settings, "TOURS_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == "sqlite":
+        return SQLiteFTS5Backend()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return DatabaseSearchBackend()
+
+
+def index_tours(tour_ids) -> None:
+    try:
+        get_backend().index_tours(tour_ids)
+    except Exception as e:
+        # indeks xatosi saqlashni buzmasin; keyin rebuild_search_index bilan tiklanadi
+        log.exception("Search index update failed: %s", e)
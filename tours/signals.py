@@ -0,0 +1,256 @@
+# tours/signals.py
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.background import run_in_background
+from core.images import delete_derivatives
+
+from .cache import bump_catalog_version
+from locations.models import City, Country
+
+from .images import IMAGE_MODELS, needs_variants, refresh_image_variants
+from .models import (
+    Tour, TourCategory, TourTag, TourStop, ItineraryDay, TourImage, TourVideo, TourDeparture,
+    TourSimilarity, ExchangeRate, EXCHANGE_RATES_CACHE_KEY, tours_bulk_updated,
+)
+from .routes import refresh_routes
+from .search import INDEXED_FIELDS, index_tours
+from .similarity import refresh_similar
+from .snapshots import invalidate_tours
+
+# Detail payload'ga kiradigan, tour FK orqali bog‘langan modellar
+TOUR_CHILD_MODELS = (TourStop, ItineraryDay, TourImage, TourVideo, TourDeparture)
+
+# o‘xshashlik balliga ta’sir qiladigan Tour maydonlari (bulk update uchun)
+SIMILARITY_FIELDS = frozenset({
+    "category", "category_id", "days", "base_price", "discount_percent", "discount_amount",
+    "effective_price", "effective_price_base", "currency", "is_active", "is_deleted",
+})
+
+_pending = threading.local()
+
+
+def tours_changed(tour_ids, touch: bool = True) -> None:
+    """
+    Snapshot'larni o‘chiradi va katalog versiyasini oshiradi.
+    Commit'dan keyin: aks holda parallel so‘rov eski ma’lumotni yangi kalit bilan keshlab qo‘yishi mumkin.
+    touch — tour.updated_at ni yangilash (ETag/Last-Modified shu ustundan olinadi).
+    """
+    tour_ids = [pk for pk in tour_ids if pk]
+    if touch and tour_ids:
+        # _base_manager: TourQuerySet.update() dagi bulk signal qayta chaqirilmasin
+        Tour._base_manager.filter(pk__in=tour_ids).update(updated_at=timezone.now())
+
+    def _apply():
+        invalidate_tours(tour_ids)
+        bump_catalog_version()
+
+    transaction.on_commit(_apply)
+
+
+def _collect(kind: str, tour_ids, flush) -> None:
+    # bir tranzaksiyadagi ko‘p signal (admin inline'lari) commit'dan keyin bitta ishga yig‘iladi
+    pending = _pending.__dict__.setdefault(kind, set())
+    pending.update(pk for pk in tour_ids if pk)
+    transaction.on_commit(flush)
+
+
+def _take(kind: str) -> set:
+    return _pending.__dict__.pop(kind, None) or set()
+
+
+def similar_tours_changed(tour_ids) -> None:
+    """O‘xshash turlar jadvalini qisman yangilash (tours.similarity.refresh_similar) — commit'dan keyin, fon ishida."""
+    _collect("similar", tour_ids, _flush_similar)
+
+
+def _flush_similar():
+    tour_ids = _take("similar")
+    if tour_ids:
+        run_in_background(_refresh_similar, tour_ids)
+
+
+def routes_changed(tour_ids) -> None:
+    """Marshrut xulosasini (tours.routes) commit'dan keyin qayta hisoblash; bitta so‘rov + o‘zgarganlarga UPDATE."""
+    _collect("routes", tour_ids, _flush_routes)
+
+
+def _flush_routes():
+    tour_ids = _take("routes")
+    if tour_ids:
+        tours_changed(refresh_routes(tour_ids))
+
+
+def search_index_changed(tour_ids) -> None:
+    """
+    Qidiruv indeksini (tours.search) qisman yangilash — faqat indekslanadigan matn o‘zgarganda
+    (sarlavha/tavsif, teglar, kategoriya nomi, ko‘rinish); commit'dan keyin, fon ishida.
+    """
+    _collect("search", tour_ids, _flush_search)
+
+
+def _flush_search():
+    tour_ids = _take("search")
+    if tour_ids:
+        run_in_background(index_tours, tour_ids)
+
+
+def _refresh_similar(tour_ids):
+    if refresh_similar(tour_ids):
+        bump_catalog_version()
+
+
+@receiver(post_save, sender=Tour)
+@receiver(post_delete, sender=Tour)
+def on_tour_changed(sender, instance: Tour, update_fields=None, **kwargs):
+    tours_changed([instance.pk], touch=False)
+    similar_tours_changed([instance.pk, *getattr(instance, "_similar_referrers", ())])
+    if update_fields is None or INDEXED_FIELDS & set(update_fields):
+        search_index_changed([instance.pk])
+
+
+@receiver(pre_delete, sender=Tour)
+def on_tour_deleting(sender, instance: Tour, **kwargs):
+    # CASCADE bu yozuvlarni o‘chiradi — shu turni ro‘yxatida tutganlarni oldindan eslab qolamiz
+    instance._similar_referrers = list(
+        TourSimilarity.objects.filter(similar=instance).values_list("tour_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=TourStop)
+@receiver(post_delete, sender=TourStop)
+def on_tour_stop_changed(sender, instance: TourStop, **kwargs):
+    similar_tours_changed([instance.tour_id])
+    routes_changed([instance.tour_id])
+
+
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=Country)
+def on_route_place_changed(sender, instance, created, **kwargs):
+    # detail'dagi route CitySerializer/CountrySerializer'ni ichiga oladi: nom o‘zgarsa ham barcha shu joydan
+    # o‘tadigan turlar eskiradi (marshrut xulosasi o‘zgarmagan bo‘lsa ham); koordinata — routes_changed orqali
+    if created:
+        return
+    if sender is City:
+        stops = TourStop.objects.filter(city_id=instance.pk)
+    else:
+        stops = TourStop.objects.filter(Q(country_id=instance.pk) | Q(city__country_id=instance.pk))
+    tour_ids = set(stops.values_list("tour_id", flat=True))
+    tours_changed(tour_ids)
+    routes_changed(tour_ids)
+
+
+def on_tour_child_changed(sender, instance, **kwargs):
+    tours_changed([instance.tour_id])
+
+
+for _model in TOUR_CHILD_MODELS:
+    post_save.connect(on_tour_child_changed, sender=_model, dispatch_uid=f"tour-child-save-{_model.__name__}")
+    post_delete.connect(on_tour_child_changed, sender=_model, dispatch_uid=f"tour-child-delete-{_model.__name__}")
+
+
+@receiver(post_save, sender=TourImage)
+@receiver(post_delete, sender=TourImage)
+def on_tour_image_changed(sender, instance: TourImage, **kwargs):
+    # is_cover / order / o‘chirish — Tour.cover ko‘rsatkichi qayta tanlanadi
+    Tour.objects.filter(pk=instance.tour_id).refresh_cover()
+
+
+def build_image_variants(model, pk):
+    # fon ishi: nusxalar tayyor bo‘lgach snapshot/kesh yangilanadi (srcset javobga kiradi)
+    tour_id = refresh_image_variants(model, pk)
+    if tour_id:
+        tours_changed([tour_id])
+
+
+def on_tour_image_saved(sender, instance, **kwargs):
+    if needs_variants(instance):
+        run_in_background(build_image_variants, sender, instance.pk)
+
+
+def on_tour_image_deleted(sender, instance, **kwargs):
+    variants = instance.image_variants
+    if variants:
+        storage = instance.image.storage
+        transaction.on_commit(lambda: delete_derivatives(storage, variants))
+
+
+for _model in IMAGE_MODELS:
+    post_save.connect(on_tour_image_saved, sender=_model, dispatch_uid=f"image-variants-save-{_model.__name__}")
+    post_delete.connect(on_tour_image_deleted, sender=_model, dispatch_uid=f"image-variants-delete-{_model.__name__}")
+
+
+@receiver(m2m_changed, sender=Tour.tags.through)
+def on_tour_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # tag tomonidan: tag.tours.add(...) / tag.tours.clear()
+        pks = list(pk_set if pk_set else instance.tours.values_list("pk", flat=True))
+    else:
+        pks = [instance.pk]
+    tours_changed(pks)
+    similar_tours_changed(pks)
+    search_index_changed(pks)
+
+
+@receiver(post_save, sender=TourCategory)
+@receiver(post_save, sender=TourTag)
+@receiver(post_delete, sender=TourTag)
+def on_category_or_tag_changed(sender, instance, **kwargs):
+    pks = list(instance.tours.values_list("pk", flat=True))
+    tours_changed(pks)
+    # kategoriya/teg nomi tur hujjatiga kiradi
+    search_index_changed(pks)
+
+
+@receiver(tours_bulk_updated, sender=Tour)
+def on_tours_bulk_updated(sender, pks, fields=(), **kwargs):
+    tours_changed(pks)
+    if SIMILARITY_FIELDS & set(fields):
+        similar_tours_changed(pks)
+    if INDEXED_FIELDS & set(fields):
+        search_index_changed(pks)
+
+
+def rates_changed() -> None:
+    # ?currency= konvertatsiyasi barcha javoblarga ta’sir qiladi — kurs keshi va katalog versiyasi
+    cache.delete(EXCHANGE_RATES_CACHE_KEY)
+    bump_catalog_version()
+
+
+def exchange_rates_changed(currencies) -> None:
+    """
+    Kursi o‘zgargan valyutalar: commit'dan keyin faqat shu valyutadagi turlar bitta UPDATE bilan
+    qayta narxlanadi. Bir tranzaksiyadagi ko‘p yozuv (load_exchange_rates --replace) — bitta ish.
+    """
+    _collect("rates", currencies, _flush_rates)
+
+
+def _flush_rates():
+    currencies = _take("rates")
+    if currencies:
+        # tours_bulk_updated -> faqat shu turlar uchun tours_changed / o‘xshashlik
+        Tour.objects.filter(currency__in=currencies).refresh_base_price()
+        rates_changed()
+
+
+@receiver(pre_save, sender=ExchangeRate)
+def on_exchange_rate_saving(sender, instance: ExchangeRate, **kwargs):
+    # valyuta kodi almashtirilsa — eski valyutadagi turlar ham qayta narxlanadi
+    if instance.pk:
+        instance._previous_currency = (
+            ExchangeRate.objects.filter(pk=instance.pk).values_list("currency", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def on_exchange_rate_changed(sender, instance: ExchangeRate, **kwargs):
+    exchange_rates_changed({instance.currency, getattr(instance, "_previous_currency", None)})
@@ -0,0 +1,135 @@
+# tours/similarity.py
+"""
+"O‘xshash turlar": teglar, kategoriya, marshrut davlatlari/shaharlari (TourStop), kunlar va narx bo‘yicha ball.
+
+Butun katalog xususiyatlari 3 ta so‘rovda xotiraga olinadi; nomzodlar teskari indeks
+(teg/davlat/shahar/kategoriya -> turlar) orqali tanlanadi — umumiy belgisi yo‘q juftliklar hisoblanmaydi.
+Natija TourSimilarity jadvaliga (har tur uchun top-K) yoziladi:
+  to‘liq: `python manage.py build_similar_tours`, qisman: refresh_similar(tour_ids) — signal orqali fon ishida.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import bump_catalog_version
+from .models import Tour, TourSimilarity, TourStop
+
+# belgi -> og‘irlik
+WEIGHTS = {"tags": 3.0, "category": 2.0, "countries": 2.0, "cities": 1.5, "days": 1.0, "price": 1.0}
+
+
+def top_k() -> int:
+    return getattr(settings, "TOURS_SIMILAR_K", 8)
+
+
+def load_features() -> dict:
+    """{tour_id: {"category", "days", "price", "tags", "countries", "cities"}} — faqat ko‘rinadigan turlar."""
+    features = {
+        pk: {"category": category_id, "days": days, "price": price,
+             "tags": set(), "countries": set(), "cities": set()}
+        for pk, category_id, days, price in Tour.objects.filter(is_active=True, is_deleted=False)
+        .values_list("pk", "category_id", "days", "effective_price_base")
+    }
+    for tour_id, tag_id in Tour.tags.through.objects.values_list("tour_id", "tourtag_id"):
+        if tour_id in features:
+            features[tour_id]["tags"].add(tag_id)
+    for tour_id, country_id, city_id in TourStop.objects.values_list("tour_id", "country_id", "city_id"):
+        if tour_id in features:
+            if country_id:
+                features[tour_id]["countries"].add(country_id)
+            if city_id:
+                features[tour_id]["cities"].add(city_id)
+    return features
+
+
+def _keys(feature) -> list[tuple]:
+    keys = [("category", feature["category"])]
+    for kind in ("tags", "countries", "cities"):
+        keys.extend((kind, value) for value in feature[kind])
+    return keys
+
+
+def build_index(features) -> dict:
+    index = defaultdict(set)
+    for pk, feature in features.items():
+        for key in _keys(feature):
+            index[key].add(pk)
+    return index
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _ratio(a, b) -> float:
+    return float(min(a, b) / max(a, b)) if a and b else 0.0
+
+
+def score(a: dict, b: dict) -> float:
+    return (
+        WEIGHTS["tags"] * _jaccard(a["tags"], b["tags"])
+        + WEIGHTS["category"] * (a["category"] == b["category"])
+        + WEIGHTS["countries"] * _jaccard(a["countries"], b["countries"])
+        + WEIGHTS["cities"] * _jaccard(a["cities"], b["cities"])
+        + WEIGHTS["days"] * _ratio(a["days"], b["days"])
+        + WEIGHTS["price"] * _ratio(a["price"], b["price"])
+    )
+
+
+def candidates(pk, features, index) -> set:
+    found = set()
+    for key in _keys(features[pk]):
+        found |= index.get(key, set())
+    found.discard(pk)
+    return found
+
+
+def neighbours(pk, features, index, k: int) -> list[tuple[int, float]]:
+    feature = features[pk]
+    scored = [(other, score(feature, features[other])) for other in candidates(pk, features, index)]
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:k]
+
+
+def _store(tour_ids, features, index) -> int:
+    k = top_k()
+    rows = [
+        TourSimilarity(tour_id=pk, similar_id=other, score=round(value, 4), rank=rank)
+        for pk in tour_ids if pk in features
+        for rank, (other, value) in enumerate(neighbours(pk, features, index, k), start=1)
+    ]
+    with transaction.atomic():
+        TourSimilarity.objects.filter(tour_id__in=tour_ids).delete()
+        TourSimilarity.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def rebuild_similar() -> int:
+    features = load_features()
+    index = build_index(features)
+    with transaction.atomic():
+        TourSimilarity.objects.all().delete()
+        rows = _store(list(features), features, index)
+    bump_catalog_version()
+    return rows
+
+
+def refresh_similar(tour_ids) -> int:
+    """
+    O‘zgargan turlar uchun: o‘zining ro‘yxati, uni hozir ro‘yxatida tutganlar va
+    yangi belgilari bo‘yicha nomzodlari qayta hisoblanadi (qolgan katalogga tegilmaydi).
+    Qaytaradi: qayta hisoblangan turlar soni.
+    """
+    tour_ids = {pk for pk in tour_ids if pk}
+    if not tour_ids:
+        return 0
+    features = load_features()
+    index = build_index(features)
+    affected = set(tour_ids)
+    affected |= set(TourSimilarity.objects.filter(similar_id__in=tour_ids).values_list("tour_id", flat=True))
+    for pk in tour_ids & features.keys():
+        affected |= candidates(pk, features, index)
+    # ko‘rinmay qolgan (o‘chirilgan/faolsiz) turlarning o‘z ro‘yxati ham tozalanadi
+    _store(affected, features, index)
+    return len(affected)
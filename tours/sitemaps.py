@@ -0,0 +1,184 @@
+# tours/sitemaps.py
+"""
+Statik XML sitemap'lar (turlar va kategoriyalar): har til uchun alohida fayl, hreflang alternativlari bilan.
+
+- bo‘lak (chunk) — pk oralig‘i: [k*N + 1, (k+1)*N], N = SITEMAP_CHUNK_SIZE (<= 50 000 URL).
+  O‘chirilgan yozuv boshqa bo‘laklarni siljitmaydi.
+- har bo‘lakning "izi" (soni, pk yig‘indisi, max(updated_at)) bitta GROUP BY so‘rovida olinadi va
+  manifest.json dagisi bilan solishtiriladi — faqat o‘zgargan bo‘laklar qayta yoziladi.
+- qatorlar .iterator() bilan oqimda o‘qiladi, fayllar vaqtinchalik nomdan os.replace bilan almashtiriladi.
+- sitemap.xml — indeks (barcha bo‘laklar, lastmod bilan), har safar qayta yoziladi.
+  `python manage.py build_sitemaps` (cron), --force — hammasini qayta yozish.
+"""
+import hashlib
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Sum
+
+from .models import Tour, TourCategory
+
+XMLNS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+XMLNS_XHTML = 'xmlns:xhtml="http://www.w3.org/1999/xhtml"'
+MANIFEST = "manifest.json"
+INDEX = "sitemap.xml"
+
+# bo‘lim -> (ko‘rinadigan yozuvlar, SITEMAP_PATHS kaliti)
+SECTIONS = {
+    "tours": (lambda: Tour._base_manager.filter(is_active=True, is_deleted=False, status="published"), "tour"),
+    "categories": (lambda: TourCategory._base_manager.filter(is_active=True, is_deleted=False), "category"),
+}
+
+
+def chunk_size() -> int:
+    return min(getattr(settings, "SITEMAP_CHUNK_SIZE", 50000), 50000)
+
+
+def languages() -> list[str]:
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def page_url(kind: str, language: str, slug: str) -> str:
+    return settings.SITE_URL.rstrip("/") + settings.SITEMAP_PATHS[kind].format(lang=language, slug=slug)
+
+
+def file_name(section: str, language: str, chunk: int) -> str:
+    return f"{section}-{language}-{chunk}.xml"
+
+
+def config_key() -> str:
+    # URL sxemasi/tillar o‘zgarsa — barcha bo‘laklar qayta yoziladi
+    data = [settings.SITE_URL, settings.SITEMAP_PATHS, languages(), settings.LANGUAGE_CODE, chunk_size()]
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def chunk_stamps(queryset, size: int) -> dict:
+    """{chunk: {"count", "pk_sum", "last"}} — bitta GROUP BY ((pk - 1) / size)."""
+    rows = (
+        queryset.order_by()
+        .annotate(chunk=(F("pk") - 1) / size)
+        .values("chunk")
+        .annotate(count=Count("pk"), pk_sum=Sum("pk"), last=Max("updated_at"))
+    )
+    return {
+        str(row["chunk"]): {"count": row["count"], "pk_sum": row["pk_sum"], "last": row["last"].isoformat()}
+        for row in rows
+    }
+
+
+def _replace(path: str, write) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _alternates(kind: str, slug: str, codes) -> str:
+    links = [
+        f'<xhtml:link rel="alternate" hreflang="{code}" href={quoteattr(page_url(kind, code, slug))}/>'
+        for code in codes
+    ]
+    default = quoteattr(page_url(kind, settings.LANGUAGE_CODE, slug))
+    links.append(f'<xhtml:link rel="alternate" hreflang="x-default" href={default}/>')
+    return "".join(links)
+
+
+def write_chunk(root: str, section: str, chunk: int, size: int) -> None:
+    """Bo‘lakning barcha tillardagi fayllari bir o‘qishda (qatorlar oqimda) yoziladi."""
+    queryset_factory, kind = SECTIONS[section]
+    codes = languages()
+    rows = (
+        queryset_factory()
+        .filter(pk__gt=chunk * size, pk__lte=(chunk + 1) * size)
+        .order_by("pk")
+        .values_list("slug", "updated_at")
+        .iterator(chunk_size=2000)
+    )
+    handles = {code: open(os.path.join(root, f"{file_name(section, code, chunk)}.tmp"), "w", encoding="utf-8")
+               for code in codes}
+    try:
+        for f in handles.values():
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset {XMLNS} {XMLNS_XHTML}>\n')
+        for slug, updated_at in rows:
+            alternates = _alternates(kind, slug, codes)
+            lastmod = updated_at.date().isoformat()
+            for code, f in handles.items():
+                f.write(
+                    f"<url><loc>{escape(page_url(kind, code, slug))}</loc><lastmod>{lastmod}</lastmod>"
+                    f"{alternates}</url>\n"
+                )
+        for f in handles.values():
+            f.write("</urlset>\n")
+    finally:
+        for f in handles.values():
+            f.close()
+    for code in codes:
+        path = os.path.join(root, file_name(section, code, chunk))
+        os.replace(f"{path}.tmp", path)
+
+
+def _load_manifest(root: str) -> dict:
+    try:
+        with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_index(root: str, sections: dict) -> None:
+    base = settings.SITEMAP_URL.rstrip("/")
+
+    def write(f):
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex {XMLNS}>\n')
+        for section, chunks in sections.items():
+            for chunk in sorted(chunks, key=int):
+                lastmod = chunks[chunk]["last"][:10]
+                for code in languages():
+                    loc = escape(f"{base}/{file_name(section, code, int(chunk))}")
+                    f.write(f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>\n")
+        f.write("</sitemapindex>\n")
+
+    _replace(os.path.join(root, INDEX), write)
+
+
+def build_sitemaps(root=None, force: bool = False) -> dict:
+    """
+    Sitemap'larni yangilaydi. Qaytaradi: {"written": [...], "removed": [...], "unchanged": n}.
+    """
+    root = root or settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    size = chunk_size()
+    manifest = _load_manifest(root)
+    if force or manifest.get("config") != config_key():
+        manifest = {}
+    previous = manifest.get("sections", {})
+    report = {"written": [], "removed": [], "unchanged": 0}
+    sections = {}
+
+    for section, (queryset_factory, _) in SECTIONS.items():
+        stamps = chunk_stamps(queryset_factory(), size)
+        old = previous.get(section, {})
+        for chunk, stamp in stamps.items():
+            files = [os.path.join(root, file_name(section, code, int(chunk))) for code in languages()]
+            if old.get(chunk) == stamp and all(os.path.exists(path) for path in files):
+                report["unchanged"] += 1
+                continue
+            write_chunk(root, section, int(chunk), size)
+            report["written"].append(f"{section}:{chunk}")
+        # bo‘shab qolgan bo‘laklar
+        for chunk in set(old) - set(stamps):
+            for code in languages():
+                path = os.path.join(root, file_name(section, code, int(chunk)))
+                if os.path.exists(path):
+                    os.remove(path)
+            report["removed"].append(f"{section}:{chunk}")
+        sections[section] = stamps
+
+    write_index(root, sections)
+    _replace(
+        os.path.join(root, MANIFEST),
+        lambda f: json.dump({"config": config_key(), "sections": sections}, f, indent=1, sort_keys=True),
+    )
+    return report
@@ -0,0 +1,57 @@
+# tours/snapshots.py
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Tour, TourSnapshot
+
+
+def request_origin(request) -> str:
+    # catalog_cache_key kabi: media URL'lar absolyut, shuning uchun sxema+host kalitga kiradi
+    return f"{request.scheme}://{request.get_host()}"
+
+
+def get_snapshot(slug: str, language: str, origin: str, updated_at):
+    """
+    Tayyor detail JSON (yoki None — hali qurilmagan / invalidatsiya qilingan / eskirgan).
+    updated_at — turning joriy holati: boshqa holatdan qurilgan nusxa ishlatilmaydi.
+    """
+    return (
+        TourSnapshot.objects.filter(slug=slug, language=language, origin=origin, source_updated_at=updated_at)
+        .values_list("payload", flat=True)
+        .first()
+    )
+
+
+def snapshot_payload(data):
+    """
+    JSONRenderer bilan bir xil kodlash (Decimal -> son): snapshot'dan berilgan javob
+    birinchi (serializatsiya qilingan) javob bilan bir xil bo‘ladi.
+    """
+    return json.loads(json.dumps(data, cls=JSONEncoder, allow_nan=not api_settings.STRICT_JSON))
+
+
+def store_snapshot(tour, language: str, origin: str, updated_at, payload) -> None:
+    """
+    updated_at — payload qurilishidan oldin o‘qilgan tour.updated_at. Tur shu orada o‘zgargan
+    bo‘lsa (invalidatsiyadan keyin kechikib yozilayotgan eski payload) — yozilmaydi.
+    """
+    try:
+        with transaction.atomic():
+            if not Tour._base_manager.filter(pk=tour.pk, updated_at=updated_at).exists():
+                return
+            TourSnapshot.objects.update_or_create(
+                slug=tour.slug, language=language, origin=origin,
+                defaults={"tour": tour, "payload": snapshot_payload(payload), "source_updated_at": updated_at},
+            )
+    except IntegrityError:
+        # parallel so‘rov allaqachon yozib qo‘ygan — muammo emas
+        pass
+
+
+def invalidate_tours(tour_ids) -> None:
+    tour_ids = [pk for pk in tour_ids if pk]
+    if tour_ids:
+        TourSnapshot.objects.filter(tour_id__in=tour_ids).delete()